@@ -1,16 +1,196 @@
+import asyncio
+import io
+import json
 import os
-import subprocess
+import re
+import secrets
+import threading
+import zipfile
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
 
-from run import _main
-from variables import CFG_FOLDER, OUTPUT_FOLDER, STATIC_FOLDER
+from application import TestPaperApplication
+from config_registry import ConfigRegistry
+from generation_catalog import GenerationCatalog
+from exceptions import (PdfConversionError, ProfilerBusyError, QueueFullError, TestPaperGeneratorError,
+                        ValidationError)
+from job_executor import Job, JobExecutor
+from metrics import CONTENT_TYPE, REGISTRY, stage_timer
+from models import GeneratedFiles
+from output_cache import CachingDocumentGenerator, OutputCache, file_digest, make_cache_key
+from output_janitor import OutputJanitor
+from pdf_converter import PdfConverterPool
+from pdf_generator import PdfDocumentGenerator
+from profiler import Profiler
+from question_bank import QuestionBank
+from services import ConfigLoader, DocumentGenerator, FileManager
+from single_flight import SingleFlight
+from warm_pool import WarmPool
+from variables import CACHE_FOLDER, CFG_VERSION, OUTPUT_FOLDER, STATIC_FOLDER
 
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+LOCK_FOLDER = os.path.join(OUTPUT_FOLDER, ".locks")  # Rendezvous files shared by uvicorn workers
+ADMIN_TOKEN_ENV = "PAPER_ADMIN_TOKEN"  # Admin features (e.g. profiling) are disabled while unset
 
-app = FastAPI()
+MAX_BATCH_COUNT = 100  # Upper bound on variants per /api/generate_batch request
+MAX_HISTORY_PAGE = 200  # Upper bound on papers per /api/history page
+GENERATION_WORKERS = 4  # Threads rendering documents and running pandoc
+GENERATION_QUEUE_SIZE = 16  # Jobs allowed to wait before requests get a 429
+PDF_CONVERTER_WORKERS = 4  # Long-lived pandoc workers; test and answer sheets convert in parallel
+PDF_CONVERSION_TIMEOUT = 60  # Seconds allowed per conversion, including time spent queued
+PDF_RENDERERS = ("pandoc", "native")  # "native" renders PDFs in-process without DOCX or pandoc
+DELIVERY_MODES = ("link", "zip")  # "zip" returns the files in the response without writing them to disk
+OUTPUT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Disk budget for cached papers and PDFs
+MAX_REVIEW_ITEMS = 200  # Upper bound on explain or statement items per review paper
+REVIEW_NAME = re.compile(r"^[\w-]{1,64}$")  # Review names become output filenames
+WARM_POOL_DEPTH = 3  # Pre-rendered variants kept ready per warm config and format
+WARM_POOL_MAX_CONFIGS = 8  # Most requested config/format pairs kept warm besides the pinned ones
+WARM_POOL_WORKERS = 1  # Background threads refilling the pools
+WARM_POOL_CONFIGS: Tuple[Tuple[str, str], ...] = ()  # (config set, config) pairs always warm in DOCX and PDF
+
+config_registry = ConfigRegistry()
+output_cache = OutputCache(CACHE_FOLDER, max_bytes=OUTPUT_CACHE_MAX_BYTES)
+file_manager = FileManager()
+test_paper_app = TestPaperApplication(
+    config_loader=ConfigLoader(registry=config_registry),
+    file_manager=file_manager,
+    document_generator=CachingDocumentGenerator(
+        DocumentGenerator(file_manager), output_cache, file_manager, "docx"
+    ),
+    pdf_generator=CachingDocumentGenerator(
+        PdfDocumentGenerator(file_manager), output_cache, file_manager, "pdf"
+    ),
+)
+job_executor = JobExecutor(max_workers=GENERATION_WORKERS, max_queue=GENERATION_QUEUE_SIZE)
+pdf_converter = PdfConverterPool(workers=PDF_CONVERTER_WORKERS, timeout=PDF_CONVERSION_TIMEOUT)
+# Identical concurrent requests share one render and one PDF conversion
+generation_flight = SingleFlight(LOCK_FOLDER)
+profiler = Profiler()
+
+
+def _prerender(key: Tuple[str, str, str, str]) -> GeneratedFiles:
+    """Render one variant for the warm pool, already converted to the requested format."""
+    config_set, config, format, output_format = key
+    generated = test_paper_app.generate_test_paper(config, output_format=output_format, config_set=config_set)
+    return _convert_generated(generated, format, use_cache=False)
+
+
+def _files_exist(generated: GeneratedFiles) -> bool:
+    """Whether both files of a paper are still in the output folder, e.g. not removed by run.py --gc."""
+    return os.path.isfile(generated.test_file_path) and os.path.isfile(generated.answer_file_path)
+
+
+warm_pool = WarmPool(
+    _prerender,
+    depth=WARM_POOL_DEPTH,
+    max_keys=WARM_POOL_MAX_CONFIGS,
+    pinned=[(config_set, config, format, "docx") for config_set, config in WARM_POOL_CONFIGS
+            for format in ("docx", "pdf")],
+    workers=WARM_POOL_WORKERS,
+    version=lambda: config_registry.version,
+    valid=_files_exist,
+)
+_question_bank: Optional[QuestionBank] = None
+_question_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """Return the question bank over every config set, rebuilt after configs change."""
+    global _question_bank
+    with _question_bank_lock:
+        if _question_bank is None or _question_bank.version != config_registry.version:
+            _question_bank = QuestionBank.from_registry(config_registry)
+        return _question_bank
+
+
+def _files_in_use() -> Set[str]:
+    """Filenames returned by jobs the server still tracks, which clients may not have fetched yet."""
+    names = set()
+    for job in job_executor.list_jobs():
+        if job.status != "done":
+            continue
+        result = job.future.result()
+        for links in result if isinstance(result, list) else [result]:
+            if isinstance(links, dict):
+                names.add(links["test"]["filename"])
+                names.add(links["ans"]["filename"])
+    # Pre-rendered variants waiting to be handed out
+    for generated in warm_pool.values():
+        names.add(os.path.basename(generated.test_file_path))
+        names.add(os.path.basename(generated.answer_file_path))
+    return names
+
+
+generation_catalog = GenerationCatalog(OUTPUT_FOLDER)
+output_janitor = OutputJanitor(OUTPUT_FOLDER, in_use=_files_in_use,
+                               on_removed=generation_catalog.mark_removed)
+
+
+GENERATION_REQUESTS = REGISTRY.counter(
+    "generation_requests_total",
+    "Generation requests accepted, by endpoint, config and format",
+    ["endpoint", "config_set", "config", "format"],
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "generation_request_seconds",
+    "Wall time of generation requests, including queueing and PDF conversion",
+    ["endpoint", "format"],
+)
+REGISTRY.gauge("generation_queue_depth", "Generation jobs waiting for a worker",
+               callback=lambda: job_executor.queue_depth())
+REGISTRY.gauge("pdf_converter_queue_depth", "PDF conversions waiting for a converter worker",
+               callback=lambda: pdf_converter.stats()["queue_depth"])
+REGISTRY.gauge("pdf_converter_busy_workers", "PDF converter workers currently converting",
+               callback=lambda: pdf_converter.stats()["busy_workers"])
+
+
+def _warm_pool_depths() -> Dict[Tuple[str, ...], int]:
+    """Warm pool depth per label set; the renderer keeps native and pandoc PDF pools apart."""
+    depths = {}
+    for pool in warm_pool.stats()["pools"]:
+        config_set, config, format, output_format = pool["key"]
+        # Matches GenerationRequest.output_format: only the native renderer outputs PDF directly
+        renderer = "native" if output_format == "pdf" else "pandoc"
+        depths[(config_set, config, format, renderer)] = pool["depth"]
+    return depths
+
+
+REGISTRY.gauge(
+    "warm_pool_depth",
+    "Pre-rendered variants ready in the warm pool",
+    ["config_set", "config", "format", "renderer"],
+    callback=_warm_pool_depths,
+)
+
+
+def _instrument(endpoint: str, request: "GenerationRequest"):
+    """Count a validated generation request and time it into generation_request_seconds."""
+    GENERATION_REQUESTS.inc(endpoint=endpoint, config_set=request.config_set, config=request.config,
+                            format=request.format)
+    return REQUEST_SECONDS.time(endpoint=endpoint, format=request.format)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background services with the web server."""
+    config_registry.start_watcher()
+    await asyncio.to_thread(pdf_converter.start)
+    output_janitor.start()
+    warm_pool.start()
+    yield
+    warm_pool.stop()
+    output_janitor.stop()
+    job_executor.shutdown(wait=False)
+    pdf_converter.shutdown()
+    config_registry.stop_watcher()
+
+
+app = FastAPI(lifespan=lifespan)
 app.mount("/static", StaticFiles(directory=STATIC_FOLDER), name="static")
 
 
@@ -24,50 +204,512 @@ async def index() -> HTMLResponse:
         return HTMLResponse(f.read())
 
 
+@app.get("/api/config_sets")
+async def list_config_sets() -> JSONResponse:
+    """Return the config sets currently served, with the default one first."""
+    config_sets = config_registry.list_config_sets()
+    if CFG_VERSION in config_sets:
+        config_sets.remove(CFG_VERSION)
+        config_sets.insert(0, CFG_VERSION)
+    return JSONResponse(content=config_sets)
+
+
 @app.get("/api/configs")
-async def list_configs() -> JSONResponse:
-    """Return a list of available JSON config files."""
-    if not os.path.isdir(CFG_FOLDER):
-        raise HTTPException(status_code=500, detail=f"Config folder not found: {CFG_FOLDER}")
-    files = [f for f in os.listdir(CFG_FOLDER) if f.endswith(".json")]
-    return JSONResponse(content=files)
+async def list_configs(config_set: str = CFG_VERSION) -> JSONResponse:
+    """Return a list of available JSON config files in a config set."""
+    if config_set not in config_registry.list_config_sets():
+        raise HTTPException(status_code=404, detail=f"Config set not found: {config_set}")
+    return JSONResponse(content=config_registry.list_files(config_set))
 
 
 def convert_to_pdf(input_path: str) -> str:
-    """Convert a DOCX file to PDF using pandoc."""
-    if not input_path.lower().endswith(".docx"):
+    """Convert a DOCX file to PDF on the converter pool."""
+    return convert_files_to_pdf([input_path])[0]
+
+
+def convert_files_to_pdf(input_paths: List[str], use_cache: bool = True) -> List[str]:
+    """Convert several DOCX files to PDF in parallel, reusing cached PDFs of identical files.
+
+    use_cache=False skips the cache for papers that will never be requested again, e.g. random ones.
+    """
+    if not all(path.lower().endswith(".docx") for path in input_paths):
         raise HTTPException(status_code=400, detail="Input file is not a DOCX")
-    output_path = os.path.splitext(input_path)[0] + ".pdf"
+
+    if use_cache:
+        keys = [
+            make_cache_key(file_digest(path), os.path.basename(path), pdf_converter.command)
+            for path in input_paths
+        ]
+    else:
+        keys = [None] * len(input_paths)
+    results = []
+    misses = []
+    for index, (path, key) in enumerate(zip(input_paths, keys)):
+        cached = output_cache.restore(key, os.path.dirname(path)) if key else None
+        results.append(cached[0] if cached else None)
+        if not cached:
+            misses.append(index)
+
+    if misses:
+        try:
+            with stage_timer("pdf_conversion"):
+                converted = pdf_converter.convert_many([input_paths[index] for index in misses])
+        except PdfConversionError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        for index, pdf_path in zip(misses, converted):
+            if keys[index]:
+                output_cache.store(keys[index], [pdf_path])
+            results[index] = pdf_path
+    return results
+
+
+class GenerationRequest(BaseModel):
+    """Parameters of a generation request, also the body of an asynchronous job."""
+    config: str
+    config_set: str = CFG_VERSION
+    format: str = "docx"
+    renderer: str = "pandoc"
+    count: int = 1
+    seed: Optional[int] = None
+    delivery: str = "link"
+
+    @property
+    def output_format(self) -> str:
+        """Format the generator renders directly; pandoc PDFs start out as DOCX."""
+        return "pdf" if self.format == "pdf" and self.renderer == "native" else "docx"
+
+    @property
+    def pool_key(self) -> Tuple[str, str, str, str]:
+        """Warm pool key: requests sharing it can be served the same kind of pre-rendered variant."""
+        return self.config_set, self.config, self.format, self.output_format
+
+
+def _validate_request(request: GenerationRequest) -> None:
+    """Reject unknown configs, out-of-range batch sizes and unknown PDF renderers."""
+    if request.config_set not in config_registry.list_config_sets():
+        raise HTTPException(status_code=400, detail="Invalid config set selected")
+    if request.config not in config_registry.list_files(request.config_set):
+        raise HTTPException(status_code=400, detail="Invalid config file selected")
+    if not 1 <= request.count <= MAX_BATCH_COUNT:
+        raise HTTPException(status_code=400, detail=f"count must be between 1 and {MAX_BATCH_COUNT}")
+    if request.renderer not in PDF_RENDERERS:
+        raise HTTPException(status_code=400, detail=f"renderer must be one of {', '.join(PDF_RENDERERS)}")
+    if request.delivery not in DELIVERY_MODES:
+        raise HTTPException(status_code=400, detail=f"delivery must be one of {', '.join(DELIVERY_MODES)}")
+
+
+def _submit(fn: Callable, *args) -> Job:
+    """Queue blocking work on the job executor, answering 429 when it is full."""
+    try:
+        return job_executor.submit(fn, *args)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(job_executor.retry_after)},
+        )
+
+
+def _generate_files(request: GenerationRequest) -> dict:
+    """Generate one test paper (blocking) and describe its download URLs."""
+    # Any variant will do when no seed is asked for, so hand out a pre-rendered one
+    generated = warm_pool.take(request.pool_key) if request.seed is None else None
+    if generated is not None:
+        return _file_links(generated, request.format, request.config, request.config_set)
+
+    def render() -> dict:
+        generated = test_paper_app.generate_test_paper(
+            request.config,
+            output_format=request.output_format,
+            config_set=request.config_set,
+            seed=request.seed,
+        )
+        generated = _convert_generated(generated, request.format, use_cache=request.seed is not None)
+        # Recorded once here, so coalesced requests share one catalog entry and its file ids
+        return _file_links(generated, request.format, request.config, request.config_set)
+
+    try:
+        return generation_flight.do(_flight_key(request, "paper"), render,
+                                    encode=lambda links: links, decode=_decode_links)
+    except TestPaperGeneratorError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _generate_batch_files(request: GenerationRequest) -> list:
+    """Generate a batch of variants (blocking) and describe their download URLs."""
+
+    def render() -> List[dict]:
+        generated_batch = test_paper_app.generate_batch(
+            request.config,
+            request.count,
+            seed=request.seed,
+            output_format=request.output_format,
+            config_set=request.config_set,
+        )
+        return [
+            _file_links(_convert_generated(generated, request.format, use_cache=request.seed is not None),
+                        request.format, request.config, request.config_set)
+            for generated in generated_batch
+        ]
+
+    try:
+        return generation_flight.do(_flight_key(request, "batch"), render,
+                                    encode=lambda batch: batch, decode=_decode_links_batch)
+    except TestPaperGeneratorError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _flight_key(request: GenerationRequest, kind: str) -> str:
+    """Coalescing key: requests agreeing on config, seed policy and format get the same files."""
+    # Requests without a seed accept any variant, so concurrent ones can share a random one
+    seed = "random" if request.seed is None else request.seed
+    return json.dumps([kind, request.config_set, request.config, request.format, request.output_format,
+                       request.count if kind == "batch" else 1, seed])
+
+
+def _decode_links(links: dict) -> Optional[dict]:
+    """Reuse download links published by another worker, or None if their files are gone."""
+    paths = [os.path.join(file_manager.output_folder, links[role]["filename"]) for role in ("test", "ans")]
+    return links if all(os.path.isfile(path) for path in paths) else None
+
+
+def _decode_links_batch(batch: list) -> Optional[List[dict]]:
+    """Reuse a published batch of links, or None if any of its files are gone."""
+    return batch if all(_decode_links(links) is not None for links in batch) else None
+
+
+def _require_admin(token: Optional[str]) -> None:
+    """Reject callers without the admin token from the environment."""
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    if not expected or not token or not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def _profiled(label: str, forced: bool, fn: Callable, *args):
+    """Run fn, under the profiler when asked to or when picked by 1-in-N sampling."""
+    if not (forced or profiler.should_sample()):
+        return fn(*args)
     try:
-        subprocess.run(["pandoc", input_path, "-o", output_path], check=True)
-    except FileNotFoundError:
-        raise HTTPException(status_code=500, detail="Pandoc not found. Please install pandoc.")
-    except subprocess.CalledProcessError as e:
-        raise HTTPException(status_code=500, detail=f"Pandoc conversion failed: {e}")
-    return output_path
+        result, record = profiler.run(label, fn, *args)
+    except ProfilerBusyError as e:
+        # Only one profile can run at a time: a sampled request simply goes unprofiled
+        if forced:
+            raise HTTPException(status_code=409, detail=str(e))
+        return fn(*args)
+    if forced and isinstance(result, dict):
+        result = {**result, "profile": {
+            "profile_id": record.profile_id,
+            "duration": record.duration,
+            "pstats_url": f"/api/admin/profiles/{record.profile_id}/pstats",
+            "folded_url": f"/api/admin/profiles/{record.profile_id}/folded",
+        }}
+    return result
+
+
+def _convert_generated(generated: GeneratedFiles, format: str, use_cache: bool) -> GeneratedFiles:
+    """Convert generated DOCX files to PDF when PDF was requested."""
+    if format == "pdf" and generated.test_file_path.lower().endswith(".docx"):
+        test_file, ans_file = convert_files_to_pdf([generated.test_file_path, generated.answer_file_path],
+                                                   use_cache=use_cache)
+        generated = replace(generated, test_file_path=test_file, answer_file_path=ans_file)
+    return generated
+
+
+def _file_links(generated: GeneratedFiles, format: str, config: str, config_set: Optional[str]) -> dict:
+    """Record generated files, already in the requested format, and describe their download URLs."""
+    file_ids = generation_catalog.record(generated, config, config_set, format)
+    test_name = os.path.basename(generated.test_file_path)
+    ans_name = os.path.basename(generated.answer_file_path)
+    return {
+        "test": {"filename": test_name, "file_id": file_ids["test"], "url": f"/api/files/{file_ids['test']}"},
+        "ans": {"filename": ans_name, "file_id": file_ids["ans"], "url": f"/api/files/{file_ids['ans']}"},
+        "seed": generated.seed,
+    }
+
+
+def _render_zip(request: GenerationRequest, batch: bool) -> Response:
+    """Render papers in memory (blocking) and return them as one ZIP response."""
+    try:
+        papers = test_paper_app.render_papers(
+            request.config,
+            count=request.count if batch else None,
+            seed=request.seed,
+            output_format=request.output_format,
+            config_set=request.config_set,
+        )
+    except TestPaperGeneratorError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    files = []
+    for paper in papers:
+        files.append((paper.test_filename, paper.test_content))
+        files.append((paper.answer_filename, paper.answer_content))
+    if request.format == "pdf" and request.output_format == "docx":
+        try:
+            converted = pdf_converter.convert_documents(files)
+        except PdfConversionError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        files = [(os.path.splitext(name)[0] + ".pdf", content) for (name, _), content in zip(files, converted)]
+
+    buffer = io.BytesIO()
+    # DOCX and PDF are already compressed, so the archive only stores them
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, content in files:
+            archive.writestr(name, content)
+
+    if batch:
+        zip_name = f"{papers[0].base_filename}_batch.zip"
+    else:
+        zip_name = os.path.splitext(papers[0].test_filename)[0] + ".zip"
+    return Response(
+        content=buffer.getvalue(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{zip_name}"'},
+    )
 
 
 @app.get("/api/generate")
-async def generate(config: str, format: str = "docx") -> JSONResponse:
-    """Generate test and answer files and return download URLs."""
-    if config not in os.listdir(CFG_FOLDER):
-        raise HTTPException(status_code=400, detail="Invalid config file selected")
-    test_docx, ans_docx = _main(config)
-    if format == "pdf":
-        test_file = convert_to_pdf(test_docx)
-        ans_file = convert_to_pdf(ans_docx)
+async def generate(config: str, format: str = "docx", renderer: str = "pandoc",
+                   config_set: str = CFG_VERSION, seed: Optional[int] = None,
+                   delivery: str = "link", profile: bool = False,
+                   x_admin_token: Optional[str] = Header(None)) -> Response:
+    """Generate test and answer files and return download URLs, or the files themselves as a ZIP.
+
+    Admins can pass profile=true to profile this request; its profile is linked in the response.
+    """
+    request = GenerationRequest(config=config, config_set=config_set, format=format,
+                                renderer=renderer, seed=seed, delivery=delivery)
+    _validate_request(request)
+    if profile:
+        _require_admin(x_admin_token)
+    label = f"generate {request.config_set}/{request.config} {request.format}"
+    with _instrument("/api/generate", request):
+        if request.delivery == "zip":
+            job = _submit(_profiled, label, profile, _render_zip, request, False)
+            return await asyncio.wrap_future(job.future)
+        job = _submit(_profiled, label, profile, _generate_files, request)
+        return JSONResponse(content=await asyncio.wrap_future(job.future))
+
+
+@app.get("/api/generate_batch")
+async def generate_batch(config: str, count: int, format: str = "docx",
+                         seed: Optional[int] = None, renderer: str = "pandoc",
+                         config_set: str = CFG_VERSION, delivery: str = "link") -> Response:
+    """Generate several shuffled variants of one config and return their download URLs or a ZIP."""
+    request = GenerationRequest(config=config, config_set=config_set, format=format,
+                                renderer=renderer, count=count, seed=seed, delivery=delivery)
+    _validate_request(request)
+    label = f"generate_batch {request.config_set}/{request.config} {request.format} x{request.count}"
+    with _instrument("/api/generate_batch", request):
+        if request.delivery == "zip":
+            job = _submit(_profiled, label, False, _render_zip, request, True)
+            return await asyncio.wrap_future(job.future)
+        job = _submit(_profiled, label, False, _generate_batch_files, request)
+        return JSONResponse(content=await asyncio.wrap_future(job.future))
+
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(request: GenerationRequest) -> JSONResponse:
+    """Queue a generation job and return immediately with its id."""
+    _validate_request(request)
+    if request.delivery != "link":
+        raise HTTPException(status_code=400, detail="Jobs only support delivery=link")
+    GENERATION_REQUESTS.inc(endpoint="/api/jobs", config_set=request.config_set, config=request.config,
+                            format=request.format)
+    if request.count > 1:
+        job = _submit(_generate_batch_files, request)
     else:
-        test_file = test_docx
-        ans_file = ans_docx
+        job = _submit(_generate_files, request)
+    return JSONResponse(status_code=202, content={
+        "job_id": job.job_id,
+        "status": job.status,
+        "url": f"/api/jobs/{job.job_id}",
+    })
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str) -> JSONResponse:
+    """Report the status of a queued job and its result once finished."""
+    job = job_executor.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    content = {"job_id": job.job_id, "status": job.status}
+    if job.status == "done":
+        content["result"] = job.future.result()
+    elif job.status == "failed":
+        error = job.future.exception()
+        content["error"] = error.detail if isinstance(error, HTTPException) else str(error)
+    return JSONResponse(content=content)
+
+
+class ReviewRequest(BaseModel):
+    """Parameters of a review paper sampled across config files."""
+    files: List[str] = ["*"]  # Glob patterns over "config_set/filename"
+    explain: int = 10
+    statement: int = 10
+    per_file_max: Optional[int] = None
+    weights: Dict[str, float] = {}  # Glob pattern -> file weight, 1 when unmatched
+    seed: Optional[int] = None
+    format: str = "docx"
+    renderer: str = "pandoc"
+    name: str = "review"
+
+    @property
+    def output_format(self) -> str:
+        """Format the generator renders directly; pandoc PDFs start out as DOCX."""
+        return "pdf" if self.format == "pdf" and self.renderer == "native" else "docx"
 
-    test_name = os.path.basename(test_file)
-    ans_name = os.path.basename(ans_file)
+
+def _generate_review(request: ReviewRequest) -> dict:
+    """Sample and generate a review paper (blocking) and describe its download URLs."""
+    bank = get_question_bank()
+    files = bank.match_files(request.files)
+    if not files:
+        raise HTTPException(status_code=400, detail="No config files match the given patterns")
+    try:
+        generated = test_paper_app.generate_review(
+            bank,
+            request.explain,
+            request.statement,
+            files=files,
+            weights=request.weights,
+            per_file_max=request.per_file_max,
+            seed=request.seed,
+            output_format=request.output_format,
+            name=request.name,
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except TestPaperGeneratorError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    generated = _convert_generated(generated, request.format, use_cache=request.seed is not None)
+    links = _file_links(generated, request.format, f"{request.name}.json", None)
+    links["files"] = files
+    return links
+
+
+@app.post("/api/review")
+async def generate_review(request: ReviewRequest) -> JSONResponse:
+    """Generate a review paper drawn from several config files and return its download URLs."""
+    if not REVIEW_NAME.match(request.name):
+        raise HTTPException(status_code=400, detail="name may only contain letters, digits, '_' and '-'")
+    for field in ("explain", "statement"):
+        if not 0 <= getattr(request, field) <= MAX_REVIEW_ITEMS:
+            raise HTTPException(status_code=400, detail=f"{field} must be between 0 and {MAX_REVIEW_ITEMS}")
+    if request.per_file_max is not None and request.per_file_max < 1:
+        raise HTTPException(status_code=400, detail="per_file_max must be at least 1")
+    if request.renderer not in PDF_RENDERERS:
+        raise HTTPException(status_code=400, detail=f"renderer must be one of {', '.join(PDF_RENDERERS)}")
+    job = _submit(_generate_review, request)
+    return JSONResponse(content=await asyncio.wrap_future(job.future))
+
+
+@app.get("/api/bank/files")
+async def bank_files() -> JSONResponse:
+    """List the config files in the question bank with their item counts."""
+    bank = await asyncio.to_thread(get_question_bank)
+    return JSONResponse(content=bank.list_files())
+
+
+@app.get("/api/bank/words/{word}")
+async def bank_word(word: str) -> JSONResponse:
+    """List every item, across all config files, whose answer is the given word."""
+    bank = await asyncio.to_thread(get_question_bank)
+    return JSONResponse(content=[
+        {"source": entry.source, "section": entry.section, "text": entry.item.text, "word": entry.item.word}
+        for entry in bank.find_word(word)
+    ])
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Expose counters, gauges and stage latency histograms in the Prometheus text format."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/api/admin/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)) -> JSONResponse:
+    """List recent request profiles, newest first."""
+    _require_admin(x_admin_token)
+    return JSONResponse(content={"sample_every": profiler.sample_every, "items": profiler.list_profiles()})
+
+
+@app.get("/api/admin/profiles/{profile_id}/{kind}")
+async def download_profile(profile_id: str, kind: str,
+                           x_admin_token: Optional[str] = Header(None)) -> FileResponse:
+    """Download a profile as pstats or as collapsed stacks for flamegraph tools."""
+    _require_admin(x_admin_token)
+    path = profiler.get_path(profile_id, kind)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path=path, filename=os.path.basename(path))
+
+
+@app.get("/api/converter/stats")
+async def converter_stats() -> JSONResponse:
+    """Report PDF converter queue depth and job counters."""
+    return JSONResponse(content=pdf_converter.stats())
+
+
+@app.get("/api/cache/stats")
+async def cache_stats() -> JSONResponse:
+    """Report output cache hits, misses and disk usage."""
+    return JSONResponse(content=output_cache.stats())
+
+
+@app.get("/api/coalescing/stats")
+async def coalescing_stats() -> JSONResponse:
+    """Report how many generation requests were served by an identical in-flight request."""
+    return JSONResponse(content=generation_flight.stats())
+
+
+@app.get("/api/pool/stats")
+async def pool_stats() -> JSONResponse:
+    """Report warm pool hit rate and the depth of each config's pool."""
+    return JSONResponse(content=warm_pool.stats())
+
+
+@app.get("/api/janitor/stats")
+async def janitor_stats() -> JSONResponse:
+    """Report output folder usage and the space reclaimed by retention passes."""
+    return JSONResponse(content=output_janitor.stats())
+
+
+@app.get("/api/history")
+async def history(limit: int = 50, before_id: Optional[int] = None, config: Optional[str] = None,
+                  config_set: Optional[str] = None, seed: Optional[int] = None,
+                  format: Optional[str] = None, since: Optional[float] = None,
+                  until: Optional[float] = None) -> JSONResponse:
+    """List generated papers newest first; pass next_before_id back as before_id for the next page."""
+    if not 1 <= limit <= MAX_HISTORY_PAGE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_HISTORY_PAGE}")
+    papers = await asyncio.to_thread(
+        generation_catalog.history, limit=limit, before_id=before_id, config=config,
+        config_set=config_set, seed=seed, format=format, since=since, until=until,
+    )
+    for paper in papers:
+        for role in ("test", "ans"):
+            if role in paper:
+                paper[role]["url"] = f"/api/files/{paper[role]['file_id']}"
     return JSONResponse(content={
-        "test": {"filename": test_name, "url": f"/download/{test_name}"},
-        "ans": {"filename": ans_name, "url": f"/download/{ans_name}"},
+        "items": papers,
+        "next_before_id": papers[-1]["id"] if len(papers) == limit else None,
     })
 
 
+@app.get("/api/files/{file_id}")
+async def download_by_id(file_id: str) -> FileResponse:
+    """Serve a generated file by its catalog id."""
+    entry = await asyncio.to_thread(generation_catalog.resolve, file_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    if entry["removed_at"] is not None or not os.path.isfile(entry["path"]):
+        raise HTTPException(status_code=410, detail="File is no longer available")
+    output_janitor.mark_downloaded(entry["path"])
+    return FileResponse(path=entry["path"], filename=entry["filename"])
+
+
 @app.get("/download/{filename}")
 async def download_file(filename: str) -> FileResponse:
     """Serve a generated file from the output directory."""
@@ -75,4 +717,5 @@ async def download_file(filename: str) -> FileResponse:
     file_path = os.path.join(OUTPUT_FOLDER, safe_name)
     if not os.path.isfile(file_path):
         raise HTTPException(status_code=404, detail="File not found")
+    output_janitor.mark_downloaded(file_path)
     return FileResponse(path=file_path, filename=safe_name)
\ No newline at end of file
@@ -3,16 +3,22 @@ Main application class that coordinates all components.
 Follows dependency injection and single responsibility principles.
 """
 import os
-from typing import Optional
+import random
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from interfaces import (
     ConfigLoaderInterface, DocumentGeneratorInterface,
     FileManagerInterface, DataShufflerInterface, GUIManagerInterface
 )
-from services import ConfigLoader, DocumentGenerator, FileManager, DataShuffler
-from gui_manager import GUIManager, IconManager
-from models import TestPaperConfig, GeneratedFiles
-from exceptions import TestPaperGeneratorError
+from services import ConfigLoader, DocumentGenerator, FileManager, DataShuffler, SEED_BITS
+from pdf_generator import PdfDocumentGenerator
+from models import TestData, TestPaperConfig, GeneratedFiles, RenderedPaper
+from exceptions import TestPaperGeneratorError, ValidationError
+from metrics import stage_timer
+
+if TYPE_CHECKING:
+    from question_bank import QuestionBank
 
 
 class TestPaperApplication:
@@ -23,7 +29,8 @@ class TestPaperApplication:
                  file_manager: Optional[FileManagerInterface] = None,
                  data_shuffler: Optional[DataShufflerInterface] = None,
                  document_generator: Optional[DocumentGeneratorInterface] = None,
-                 gui_manager: Optional[GUIManagerInterface] = None):
+                 gui_manager: Optional[GUIManagerInterface] = None,
+                 pdf_generator: Optional[DocumentGeneratorInterface] = None):
         """Initialize application with dependency injection."""
         
         # Use dependency injection or create default implementations
@@ -31,24 +38,31 @@ class TestPaperApplication:
         self.config_loader = config_loader or ConfigLoader()
         self.data_shuffler = data_shuffler or DataShuffler()
         self.document_generator = document_generator or DocumentGenerator(self.file_manager)
+        self.pdf_generator = pdf_generator or PdfDocumentGenerator(self.file_manager)
         
         # GUI manager is created on demand
         self._gui_manager = gui_manager
     
-    def generate_test_paper(self, input_filename: str, print_file: bool = False) -> GeneratedFiles:
-        """Generate test paper from input configuration file."""
+    def generate_test_paper(self, input_filename: str, print_file: bool = False,
+                            output_format: str = "docx", config_set: Optional[str] = None,
+                            seed: Optional[int] = None) -> GeneratedFiles:
+        """Generate test paper as DOCX or native PDF; the seed of an earlier paper reproduces it."""
         try:
             # Load and validate configuration
-            test_data = self.config_loader.load_config(input_filename)
+            with stage_timer("load_config"):
+                test_data = self.config_loader.load_config(input_filename, config_set)
             
             # Shuffle data for randomization
-            shuffled_data = self.data_shuffler.shuffle_data(test_data)
+            with stage_timer("shuffle_data"):
+                shuffled_data = self.data_shuffler.shuffle_data(test_data, seed=seed)
             
             # Create configuration
             config = TestPaperConfig(input_filename=input_filename)
             
             # Generate documents
-            generated_files = self.document_generator.generate_test_paper(shuffled_data, config)
+            generator = self._get_generator(output_format)
+            with stage_timer("generate_documents"):
+                generated_files = generator.generate_test_paper(shuffled_data, config)
             
             # Handle printing if requested
             if print_file:
@@ -62,9 +76,78 @@ class TestPaperApplication:
             else:
                 raise TestPaperGeneratorError(f"Unexpected error: {e}")
     
+    def generate_batch(self, input_filename: str, count: int, seed: Optional[int] = None,
+                       output_format: str = "docx",
+                       config_set: Optional[str] = None) -> List[GeneratedFiles]:
+        """Generate several shuffled variants of one configuration in a single call."""
+        if count < 1:
+            raise ValidationError("Batch count must be at least 1")
+        
+        try:
+            # Load and validate configuration once for the whole batch
+            test_data = self.config_loader.load_config(input_filename, config_set)
+            
+            variants = self._shuffle_variants(test_data, count, seed)
+            
+            config = TestPaperConfig(input_filename=input_filename)
+            generator = self._get_generator(output_format)
+            return generator.generate_test_papers(variants, config)
+            
+        except Exception as e:
+            if isinstance(e, TestPaperGeneratorError):
+                raise
+            else:
+                raise TestPaperGeneratorError(f"Unexpected error: {e}")
+    
+    def render_papers(self, input_filename: str, count: Optional[int] = None, seed: Optional[int] = None,
+                      output_format: str = "docx",
+                      config_set: Optional[str] = None) -> List[RenderedPaper]:
+        """Render papers into memory: one paper like generate_test_paper, or a batch when count is given."""
+        if count is not None and count < 1:
+            raise ValidationError("Batch count must be at least 1")
+        
+        try:
+            test_data = self.config_loader.load_config(input_filename, config_set)
+            if count is None:
+                variants = [self.data_shuffler.shuffle_data(test_data, seed=seed)]
+            else:
+                variants = self._shuffle_variants(test_data, count, seed)
+            
+            config = TestPaperConfig(input_filename=input_filename)
+            generator = self._get_generator(output_format)
+            return [generator.render_test_paper(variant, config) for variant in variants]
+            
+        except Exception as e:
+            if isinstance(e, TestPaperGeneratorError):
+                raise
+            else:
+                raise TestPaperGeneratorError(f"Unexpected error: {e}")
+    
+    def generate_review(self, bank: "QuestionBank", explain_count: int, statement_count: int,
+                        files: Optional[List[str]] = None, weights: Optional[Dict[str, float]] = None,
+                        per_file_max: Optional[int] = None, seed: Optional[int] = None,
+                        output_format: str = "docx", name: str = "review") -> GeneratedFiles:
+        """Generate a review paper sampled across the files of a question bank."""
+        try:
+            # Sampled items come out in random order, so no further shuffle is needed
+            test_data = bank.sample(explain_count, statement_count, files=files, weights=weights,
+                                    per_file_max=per_file_max, seed=seed)
+            
+            config = TestPaperConfig(input_filename=f"{name}.json")
+            generator = self._get_generator(output_format)
+            return generator.generate_test_paper(test_data, config)
+            
+        except Exception as e:
+            if isinstance(e, TestPaperGeneratorError):
+                raise
+            else:
+                raise TestPaperGeneratorError(f"Unexpected error: {e}")
+    
     def run_gui_mode(self) -> None:
         """Run the application in GUI mode."""
         if not self._gui_manager:
+            # tkinter and PIL are imported only when the GUI is actually opened
+            from gui_manager import GUIManager, IconManager
             icon_manager = IconManager()
             self._gui_manager = GUIManager(
                 available_files_callback=self.config_loader.get_available_files,
@@ -74,9 +157,33 @@ class TestPaperApplication:
         
         self._gui_manager.run_gui()
     
-    def get_available_files(self) -> list:
+    def get_available_files(self, config_set: Optional[str] = None) -> list:
         """Get list of available configuration files."""
-        return self.config_loader.get_available_files()
+        return self.config_loader.get_available_files(config_set)
+    
+    def get_config_sets(self) -> list:
+        """Get list of available config sets."""
+        return self.config_loader.get_config_sets()
+    
+    def _shuffle_variants(self, test_data: TestData, count: int, seed: Optional[int]) -> List[TestData]:
+        """Derive one shuffle seed per variant so a batch seed reproduces the whole set."""
+        rng = random.Random(seed)
+        variants = [
+            self.data_shuffler.shuffle_data(test_data, seed=rng.getrandbits(SEED_BITS))
+            for _ in range(count)
+        ]
+        if seed is None:
+            # Seeds derived from a random batch seed cannot be asked for again
+            variants = [replace(variant, caller_seeded=False) for variant in variants]
+        return variants
+    
+    def _get_generator(self, output_format: str) -> DocumentGeneratorInterface:
+        """Select the document generator for the requested output format."""
+        if output_format == "docx":
+            return self.document_generator
+        if output_format == "pdf":
+            return self.pdf_generator
+        raise ValidationError(f"Unsupported output format: {output_format}")
     
     def _gui_generate_callback(self, filename: str, print_file: bool) -> None:
         """Callback function for GUI file generation."""
@@ -84,6 +191,7 @@ class TestPaperApplication:
         print(f"Generated files:")
         print(f"  Test: {generated_files.test_file_path}")
         print(f"  Answer: {generated_files.answer_file_path}")
+        print(f"  Seed: {generated_files.seed}")
     
     def _handle_printing(self, filepath: str) -> None:
         """Handle file printing for Windows."""
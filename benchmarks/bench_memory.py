@@ -0,0 +1,150 @@
+"""
+Benchmark: memory of a large question bank, slotted models vs. the previous plain dataclasses.
+Loads every bundled config set several times over (as separately parsed files, like merged
+curriculum years), keeps a number of shuffled variants alive and reports traced memory.
+
+Usage:
+    python benchmarks/bench_memory.py [--copies 20] [--variants 200]
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exceptions import TestPaperGeneratorError  # noqa: E402
+from services import DataShuffler, parse_config_data  # noqa: E402
+from variables import BASE_DIR, CFG_SET_PREFIX  # noqa: E402
+
+MERGED_VARIANTS = 5  # Shuffles of the single merged bank kept alive
+
+
+@dataclass(frozen=True)
+class LegacyTestItem:
+    """TestItem as it was before slots and interning."""
+    text: str
+    word: str
+
+
+@dataclass(frozen=True)
+class LegacyTestData:
+    """TestData as it was before slots and index permutations."""
+    explain_items: Sequence[LegacyTestItem]
+    statement_items: Sequence[LegacyTestItem]
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "explain_items", tuple(self.explain_items))
+        object.__setattr__(self, "statement_items", tuple(self.statement_items))
+
+
+def legacy_parse(data: dict) -> LegacyTestData:
+    """Parse a config the way parse_config_file used to."""
+    return LegacyTestData(
+        explain_items=[LegacyTestItem(text=text, word=word) for text, word in data.get("explain", [])],
+        statement_items=[LegacyTestItem(text=text, word=word) for text, word in data.get("statement", [])],
+    )
+
+
+def legacy_shuffle(test_data: LegacyTestData, seed: int) -> LegacyTestData:
+    """Shuffle the way DataShuffler used to: copy both item lists, then shuffle the copies."""
+    rng = random.Random(seed)
+    explain = list(test_data.explain_items)
+    statement = list(test_data.statement_items)
+    rng.shuffle(explain)
+    rng.shuffle(statement)
+    return LegacyTestData(explain_items=explain, statement_items=statement, seed=seed)
+
+
+def current_parse(data: dict):
+    """Parse with the current models, skipping configs the validator rejects."""
+    try:
+        return parse_config_data(data)
+    except TestPaperGeneratorError:
+        return None
+
+
+def read_sources() -> list:
+    """Raw JSON text of every config file in every config set."""
+    sources = []
+    for path in sorted(glob.glob(os.path.join(BASE_DIR, f"{CFG_SET_PREFIX}*", "*.json"))):
+        with open(path, encoding="utf8") as f:
+            sources.append(f.read())
+    return sources
+
+
+def measure(parse, shuffle, sources: list, copies: int, variants: int) -> dict:
+    """Trace memory of the loaded bank and of the shuffled variants kept alive on top of it."""
+    gc.collect()
+    tracemalloc.start()
+    # Each copy is decoded separately, so equal strings start out as distinct objects
+    bank = [parse(json.loads(source)) for _ in range(copies) for source in sources]
+    bank = [test_data for test_data in bank if test_data is not None]
+    bank_bytes = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    shuffled = [shuffle(bank[index % len(bank)], index) for index in range(variants)]
+    shuffle_seconds = time.perf_counter() - start
+    total_bytes = tracemalloc.get_traced_memory()[0]
+
+    # One bank holding every item, as when cfg sets are merged, shuffled a few times
+    merged = type(bank[0])(
+        explain_items=[item for test_data in bank for item in test_data.explain_items],
+        statement_items=[item for test_data in bank for item in test_data.statement_items],
+    )
+    merged_start = tracemalloc.get_traced_memory()[0]
+    merged_shuffled = [shuffle(merged, index) for index in range(MERGED_VARIANTS)]
+    merged_bytes = (tracemalloc.get_traced_memory()[0] - merged_start) / len(merged_shuffled)
+    tracemalloc.stop()
+
+    items = sum(len(t.explain_items) + len(t.statement_items) for t in bank)
+    result = {
+        "items": items,
+        "bank_mb": bank_bytes / 1e6,
+        "bytes_per_item": bank_bytes / items,
+        "bytes_per_variant": (total_bytes - bank_bytes) / len(shuffled),
+        "shuffle_us": shuffle_seconds / len(shuffled) * 1e6,
+        "merged_variant_kb": merged_bytes / 1e3,
+    }
+    del bank, shuffled, merged, merged_shuffled
+    gc.collect()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, default=20, help="Times every config set is loaded")
+    parser.add_argument("--variants", type=int, default=200, help="Shuffled variants kept alive")
+    args = parser.parse_args()
+
+    sources = read_sources()
+    shuffler = DataShuffler()
+    rows = [
+        ("plain dataclasses, list copies", measure(legacy_parse, legacy_shuffle, sources,
+                                                   args.copies, args.variants)),
+        ("slots, interning, permutations", measure(current_parse,
+                                                   lambda data, seed: shuffler.shuffle_data(data, seed=seed),
+                                                   sources, args.copies, args.variants)),
+    ]
+
+    print(f"{len(sources)} config files x {args.copies} copies, {args.variants} variants")
+    print(f"{'representation':<34}{'items':>8}{'bank MB':>10}{'B/item':>9}{'B/variant':>11}"
+          f"{'shuffle us':>12}{'merged KB/variant':>19}")
+    for name, r in rows:
+        print(f"{name:<34}{r['items']:>8}{r['bank_mb']:>10.2f}{r['bytes_per_item']:>9.0f}"
+              f"{r['bytes_per_variant']:>11.0f}{r['shuffle_us']:>12.1f}{r['merged_variant_kb']:>19.1f}")
+    before, after = rows[0][1], rows[1][1]
+    print(f"Bank memory: {before['bank_mb'] / after['bank_mb']:.1f}x smaller, "
+          f"merged bank variant: {before['merged_variant_kb'] / after['merged_variant_kb']:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
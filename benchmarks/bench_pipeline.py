@@ -0,0 +1,262 @@
+"""
+Benchmark suite: every stage of the generation pipeline, with baseline regression checks.
+Times config loading, shuffling, DOCX rendering (template engine, and python-docx split into
+content, formatting and save), writing a paper to disk and PDF conversion through a local pandoc
+stand-in, on the bundled cfg-* sets and on synthetic banks of 10, 1k and 100k items.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--rounds 15] [--sizes 10 1000 100000] [--output results.json]
+    python benchmarks/bench_pipeline.py --save-baseline               # record benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json --threshold 0.25
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+
+from models import TestPaperConfig  # noqa: E402
+from pdf_converter import PdfConverterPool  # noqa: E402
+from services import (ConfigLoader, DataShuffler, DocumentGenerator, FileManager,  # noqa: E402
+                      build_header_text)
+from variables import BASE_DIR, CFG_SET_PREFIX  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+PANDOC_STANDIN = os.path.join(BENCH_DIR, "pandoc_standin.py")
+PYTHON_DOCX_MAX_ITEMS = 5000  # Larger banks skip the python-docx stages, which take minutes there
+NOISE_FLOOR_MS = 1.0  # Slowdowns smaller than this are scheduler jitter, never regressions
+SYNTHETIC_SET = "cfg-bench"
+
+
+def synthetic_word(index: int) -> str:
+    """A unique lowercase word for an index: wa, wb, ..., wz, wba, wbb, ..."""
+    letters = []
+    while True:
+        index, digit = divmod(index, 26)
+        letters.append(chr(ord("a") + digit))
+        if not index:
+            return "w" + "".join(reversed(letters))
+
+
+def write_synthetic_config(folder: str, items: int) -> str:
+    """Write a config with half explain and half statement items, returning its filename."""
+    explain_count = max(1, items // 2)
+    statement_count = max(1, items - explain_count)
+    data = {
+        "explain": [
+            [f"meaning number {index} of a synthetic vocabulary entry", synthetic_word(index)]
+            for index in range(explain_count)
+        ],
+        "statement": [
+            [f"The class talked about {synthetic_word(index)} during the lesson.", synthetic_word(index)]
+            for index in range(explain_count, explain_count + statement_count)
+        ],
+    }
+    filename = f"synthetic-{items}.json"
+    with open(os.path.join(folder, filename), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return filename
+
+
+def time_stage(fn: Callable[[int], object], rounds: int) -> Dict[str, float]:
+    """Run fn(round) after one warm-up call and summarise its wall time in milliseconds."""
+    fn(-1)
+    timings = []
+    for index in range(rounds):
+        start = time.perf_counter()
+        fn(index)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": timings[0],
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "rounds": rounds,
+    }
+
+
+def bench_case(name: str, loader: ConfigLoader, config_set: str, filenames: List[str],
+               output_folder: str, converter: PdfConverterPool, rounds: int) -> Dict[str, Dict[str, float]]:
+    """Time every pipeline stage on one case; rounds cycle through its config files."""
+    loaded = [loader.load_config(filename, config_set) for filename in filenames]
+    shuffler = DataShuffler()
+    shuffled = [shuffler.shuffle_data(test_data, seed=index) for index, test_data in enumerate(loaded)]
+    configs = [TestPaperConfig(input_filename=filename) for filename in filenames]
+    items = max(test_data.get_total_items() for test_data in loaded)
+
+    def pick(index: int) -> int:
+        return index % len(filenames)
+
+    file_manager = FileManager(output_folder)
+    template = DocumentGenerator(file_manager, use_template=True)
+    legacy = DocumentGenerator(file_manager, use_template=False)
+    results = {
+        "load_config": time_stage(lambda i: loader.load_config(filenames[pick(i)], config_set), rounds),
+        "shuffle_data": time_stage(lambda i: shuffler.shuffle_data(loaded[pick(i)], seed=i), rounds),
+        "render_template": time_stage(
+            lambda i: template._render_documents(shuffled[pick(i)], configs[pick(i)], "t.docx", "a.docx"),
+            rounds,
+        ),
+        "generate_test_paper": time_stage(
+            lambda i: template.generate_test_paper(shuffled[pick(i)], configs[pick(i)]), rounds
+        ),
+    }
+
+    if items <= PYTHON_DOCX_MAX_ITEMS:
+        results.update(bench_python_docx(legacy, shuffled, configs, pick, rounds))
+
+    docx_paths = [template.generate_test_paper(test_data, config).test_file_path
+                  for test_data, config in zip(shuffled, configs)]
+    results["convert_to_pdf"] = time_stage(lambda i: converter.convert(docx_paths[pick(i)]), rounds)
+    return {f"{name}/{stage}": result for stage, result in results.items()}
+
+
+def bench_python_docx(generator: DocumentGenerator, shuffled: list, configs: list,
+                      pick: Callable[[int], int], rounds: int) -> Dict[str, Dict[str, float]]:
+    """Time the python-docx path stage by stage: content, formatting and header, save."""
+    documents = {}
+
+    def content(i: int) -> None:
+        test_doc, ans_doc = Document(), Document()
+        generator._generate_document_content(test_doc, ans_doc, shuffled[pick(i)], configs[pick(i)])
+        documents[i] = (test_doc, ans_doc)
+
+    def formatting(i: int) -> None:
+        test_doc, ans_doc = documents[i]
+        for doc, name in ((test_doc, "t.docx"), (ans_doc, "a.docx")):
+            generator._apply_document_formatting(doc, configs[pick(i)])
+            generator._set_document_header(doc, build_header_text(name, shuffled[pick(i)].seed))
+
+    def save(i: int) -> None:
+        for doc in documents.pop(i):
+            doc.save(io.BytesIO())
+
+    # Each stage runs for every round before the next one starts, so documents are kept per round
+    return {
+        "python_docx_content": time_stage(content, rounds),
+        "python_docx_formatting": time_stage(formatting, rounds),
+        "python_docx_save": time_stage(save, rounds),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """Describe every stage whose fastest round is slower than the baseline by more than the threshold and the noise floor."""
+    regressions = []
+    for key, result in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        # The fastest round is the least disturbed by other processes, so it is the most stable to compare
+        before, after = previous["min_ms"], result["min_ms"]
+        if after > before * (1 + threshold) and after - before > NOISE_FLOOR_MS:
+            regressions.append(f"{key}: {before:.3f} ms -> {after:.3f} ms (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def package_version(name: str) -> str:
+    """Installed version of a package, or "missing"."""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "missing"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=15, help="Timed runs per stage")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10, 1000, 100000],
+                        help="Items in each synthetic bank")
+    parser.add_argument("--config-sets", nargs="*", help="Bundled cfg-* sets to include (default: all)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against this results file and fail on regressions")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help=f"Save the results as the baseline (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown of a stage's fastest round before it counts as a regression")
+    args = parser.parse_args()
+
+    config_sets = args.config_sets
+    if config_sets is None:
+        config_sets = sorted(os.path.basename(path) for path in glob.glob(os.path.join(BASE_DIR, f"{CFG_SET_PREFIX}*"))
+                             if os.path.isdir(path))
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        synthetic_folder = os.path.join(work_dir, SYNTHETIC_SET)
+        output_folder = os.path.join(work_dir, "output")
+        os.makedirs(synthetic_folder)
+        os.makedirs(output_folder)
+        converter = PdfConverterPool(workers=1, command=[sys.executable, PANDOC_STANDIN])
+        try:
+            for config_set in config_sets:
+                loader = ConfigLoader(os.path.join(BASE_DIR, config_set))
+                filenames = sorted(loader.get_available_files(config_set))
+                valid = []
+                for filename in filenames:
+                    try:
+                        loader.load_config(filename, config_set)
+                        valid.append(filename)
+                    except Exception:
+                        continue
+                print(f"Benchmarking {config_set} ({len(valid)} configs)...")
+                results.update(bench_case(config_set, loader, config_set, valid, output_folder,
+                                          converter, args.rounds))
+
+            loader = ConfigLoader(synthetic_folder)
+            for size in args.sizes:
+                filename = write_synthetic_config(synthetic_folder, size)
+                print(f"Benchmarking synthetic bank of {size} items...")
+                results.update(bench_case(f"synthetic-{size}", loader, SYNTHETIC_SET, [filename],
+                                          output_folder, converter, args.rounds))
+        finally:
+            converter.shutdown()
+
+    report = {
+        "meta": {
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "python_docx": package_version("python-docx"),
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+
+    print(f"{'case/stage':<52}{'min ms':>12}{'median ms':>12}{'p95 ms':>12}")
+    for key, result in results.items():
+        print(f"{key:<52}{result['min_ms']:>12.3f}{result['median_ms']:>12.3f}{result['p95_ms']:>12.3f}")
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold)
+        print(f"Baseline: {args.baseline} (python-docx {baseline['meta'].get('python_docx')}, "
+              f"now {report['meta']['python_docx']})")
+        if regressions:
+            print(f"{len(regressions)} stages regressed by more than {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No stage regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
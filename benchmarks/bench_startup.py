@@ -0,0 +1,124 @@
+"""
+Startup benchmark: import time of run.py for --help, config listing and single-paper generation.
+Runs each command under "python -X importtime" in a fresh process, sums the import time of
+everything run.py pulls in (interpreter startup is measured separately and left out), checks it
+against a budget and fails if a mode imports a heavy module it does not need.
+
+Usage:
+    python benchmarks/bench_startup.py [--rounds 5] [--budget-scale 1.0] [--output results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Set, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RUN_PY = os.path.join(os.path.dirname(BENCH_DIR), "run.py")
+GENERATE_INPUT = "AL-p01.json"
+
+# Modules that are slow to import and only needed by some modes
+GUI_MODULES = {"tkinter", "PIL"}
+DOCX_MODULES = {"docx"}
+WEB_MODULES = {"fastapi", "starlette", "uvicorn"}
+
+# name: (run.py arguments, import budget in ms, top-level packages that must not be imported)
+SCENARIOS = {
+    "help": (["--help"], 40, GUI_MODULES | DOCX_MODULES | WEB_MODULES),
+    "list": (["--list"], 80, GUI_MODULES | DOCX_MODULES | WEB_MODULES),
+    "generate": (["-i", GENERATE_INPUT], 250, GUI_MODULES | WEB_MODULES),
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, str, float]]:
+    """(nesting level, module, cumulative ms) for every line of -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((level, name.strip(), int(cumulative) / 1000))
+    return entries
+
+
+def run_importtime(args: List[str], cwd: str) -> Tuple[List[Tuple[int, str, float]], float]:
+    """Run python -X importtime with the arguments, returning its import entries and wall time in ms."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=cwd,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"{' '.join(args)} exited with {completed.returncode}: {' '.join(errors)}")
+    return parse_importtime(completed.stderr), wall_ms
+
+
+def interpreter_modules(cwd: str) -> Set[str]:
+    """Top-level modules imported by the interpreter itself (site, encodings, .pth hooks)."""
+    entries, _ = run_importtime(["-c", "pass"], cwd)
+    return {name for level, name, _ in entries if level == 0}
+
+
+def bench_scenario(args: List[str], startup: Set[str], cwd: str, rounds: int) -> Dict[str, object]:
+    """Median import and wall time of one command, and every top-level package it imported."""
+    import_ms, wall_ms, packages = [], [], set()
+    for _ in range(rounds):
+        entries, wall = run_importtime([RUN_PY] + args, cwd)
+        import_ms.append(sum(ms for level, name, ms in entries if level == 0 and name not in startup))
+        wall_ms.append(wall)
+        packages.update(name.split(".")[0] for _, name, _ in entries)
+    return {
+        "import_ms": statistics.median(import_ms),
+        "wall_ms": statistics.median(wall_ms),
+        "packages": sorted(packages),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5, help="Runs per command")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. 2 on a slow CI machine")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, object]] = {}
+    failures = []
+    # Generated papers land in the working directory's output folder
+    with tempfile.TemporaryDirectory() as work_dir:
+        startup = interpreter_modules(work_dir)
+        for name, (run_args, budget_ms, forbidden) in SCENARIOS.items():
+            result = bench_scenario(run_args, startup, work_dir, args.rounds)
+            result["budget_ms"] = budget_ms * args.budget_scale
+            results[name] = result
+            if result["import_ms"] > result["budget_ms"]:
+                failures.append(f"{name}: imports took {result['import_ms']:.1f} ms, "
+                                f"budget {result['budget_ms']:.0f} ms")
+            loaded = sorted(forbidden.intersection(result["packages"]))
+            if loaded:
+                failures.append(f"{name}: imported {', '.join(loaded)}")
+
+    print(f"{'command':<12}{'import ms':>12}{'budget ms':>12}{'wall ms':>12}")
+    for name, result in results.items():
+        print(f"{name:<12}{result['import_ms']:>12.1f}{result['budget_ms']:>12.0f}{result['wall_ms']:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+    if failures:
+        print(f"{len(failures)} startup checks failed:")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print("Every command started within its budget")
+
+
+if __name__ == "__main__":
+    main()
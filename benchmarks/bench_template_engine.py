@@ -0,0 +1,63 @@
+"""
+Benchmark: preparsed DOCX template engine vs. python-docx paragraph building.
+Renders the same shuffled paper with both DocumentGenerator paths and reports the per-paper speedup.
+
+Usage:
+    python benchmarks/bench_template_engine.py [-i AL-p01.json] [-n 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TestPaperConfig  # noqa: E402
+from services import ConfigLoader, DataShuffler, DocumentGenerator, FileManager  # noqa: E402
+
+
+def time_paths(generator: DocumentGenerator, test_data, config, rounds: int) -> list:
+    """Time rendering one test paper plus answer sheet, once per round."""
+    timings = []
+    for index in range(rounds):
+        start = time.perf_counter()
+        generator._render_test_paper(test_data, config, f"bench-{index}_test.docx",
+                                     f"bench-{index}_test-ans.docx")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-i", "--input", default="AL-p01.json", help="Config file in the cfg folder")
+    parser.add_argument("-n", "--rounds", type=int, default=50, help="Papers rendered per path")
+    args = parser.parse_args()
+
+    test_data = DataShuffler().shuffle_data(ConfigLoader().load_config(args.input), seed=0)
+    config = TestPaperConfig(input_filename=args.input)
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        file_manager = FileManager(output_folder)
+        legacy = DocumentGenerator(file_manager, use_template=False)
+        template = DocumentGenerator(file_manager, use_template=True)
+
+        # Warm up both paths; the template engine builds its base document here
+        time_paths(legacy, test_data, config, 1)
+        time_paths(template, test_data, config, 1)
+
+        legacy_times = time_paths(legacy, test_data, config, args.rounds)
+        template_times = time_paths(template, test_data, config, args.rounds)
+
+    legacy_ms = statistics.median(legacy_times) * 1000
+    template_ms = statistics.median(template_times) * 1000
+    print(f"Config: {args.input} ({test_data.get_total_items()} items), {args.rounds} papers per path")
+    print(f"{'path':<40}{'median ms/paper':>16}")
+    print(f"{'python-docx content + formatting':<40}{legacy_ms:>16.2f}")
+    print(f"{'preparsed template engine':<40}{template_ms:>16.2f}")
+    print(f"Speedup: {legacy_ms / template_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Offline stand-in for pandoc used by the benchmarks.
+Accepts "--version" and "<input> -o <output>", and writes a minimal PDF after an optional delay
+(PANDOC_STANDIN_DELAY seconds) so PDF conversion can be timed without pandoc or a TeX install.
+"""
+import os
+import sys
+import time
+
+MINIMAL_PDF = b"%PDF-1.4\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n"
+
+
+def main():
+    args = sys.argv[1:]
+    if args == ["--version"]:
+        print("pandoc-standin 1.0")
+        return
+    if len(args) != 3 or args[1] != "-o":
+        sys.exit("usage: pandoc_standin.py <input> -o <output>")
+    with open(args[0], "rb") as f:
+        f.read()
+    time.sleep(float(os.environ.get("PANDOC_STANDIN_DELAY", "0")))
+    with open(args[2], "wb") as f:
+        f.write(MINIMAL_PDF)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+In-memory registry of every configuration set.
+Loads all cfg-* folders once, keeps the parsed TestData in memory and reloads files whose
+modification time or size changed, so serving a request needs no config I/O.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from exceptions import ConfigurationError, TestPaperGeneratorError
+from models import TestData
+from services import parse_config_file
+from variables import BASE_DIR, CFG_SET_PREFIX
+
+
+@dataclass(frozen=True)
+class ConfigEntry:
+    """A parsed config file together with the file stamp it was parsed from."""
+    stamp: Tuple[int, int]  # (mtime_ns, size)
+    test_data: Optional[TestData] = None
+    error: Optional[TestPaperGeneratorError] = None
+
+
+class ConfigRegistry:
+    """Caches every config of every config set and keeps the cache in sync with disk."""
+
+    def __init__(self, base_dir: str = BASE_DIR, poll_interval: float = 2.0):
+        self.base_dir = base_dir
+        self.poll_interval = poll_interval
+        # Replaced wholesale on refresh, so readers never need a lock
+        self._sets: Dict[str, Dict[str, ConfigEntry]] = {}
+        # Bumped whenever a file or set is added, changed or removed, so derived data can rebuild
+        self.version = 0
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.refresh()
+
+    def get_config(self, config_set: str, filename: str) -> TestData:
+        """Return the cached, immutable TestData for a config file."""
+        entry = self._sets.get(config_set, {}).get(filename)
+        if entry is None:
+            # The file may have been added since the last scan
+            entry = self._reload_file(config_set, filename)
+        if entry is None:
+            raise ConfigurationError(
+                f"Configuration file not found: {os.path.join(self.base_dir, config_set, filename)}"
+            )
+        if entry.error is not None:
+            raise entry.error
+        return entry.test_data
+
+    def list_files(self, config_set: str) -> List[str]:
+        """List the config files of one config set."""
+        return sorted(self._sets.get(config_set, {}))
+
+    def iter_entries(self) -> Iterator[Tuple[str, str, ConfigEntry]]:
+        """Yield (config set, filename, entry) for every cached config file."""
+        for config_set, entries in sorted(self._sets.items()):
+            for filename, entry in sorted(entries.items()):
+                yield config_set, filename, entry
+
+    def list_config_sets(self) -> List[str]:
+        """List the config sets currently loaded."""
+        return sorted(self._sets)
+
+    def refresh(self) -> None:
+        """Rescan all config folders, reparsing only files whose stamp changed."""
+        with self._refresh_lock:
+            current = self._sets
+            updated = {}
+            changed = False
+            for config_set in self._scan_config_sets():
+                folder = os.path.join(self.base_dir, config_set)
+                old_entries = current.get(config_set, {})
+                entries = {}
+                try:
+                    filenames = [f for f in os.listdir(folder) if f.endswith(".json")]
+                except OSError:
+                    continue
+                for filename in filenames:
+                    stamp = self._stat(os.path.join(folder, filename))
+                    if stamp is None:
+                        continue
+                    entry = old_entries.get(filename)
+                    if entry is None or entry.stamp != stamp:
+                        entry = self._parse(os.path.join(folder, filename), stamp)
+                        changed = True
+                    entries[filename] = entry
+                if entries.keys() != old_entries.keys():
+                    changed = True
+                updated[config_set] = entries
+
+            for config_set in updated.keys() - current.keys():
+                print(f"Config set loaded: {config_set} ({len(updated[config_set])} files)")
+            for config_set in current.keys() - updated.keys():
+                print(f"Config set unloaded: {config_set}")
+            self._sets = updated
+            if changed or updated.keys() != current.keys():
+                self.version += 1
+
+    def start_watcher(self) -> None:
+        """Poll the config folders in a background thread to pick up changes."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        """Stop the background polling thread."""
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
+
+    def _watch(self) -> None:
+        """Refresh the registry until asked to stop."""
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: Failed to refresh config registry: {e}")
+
+    def _scan_config_sets(self) -> List[str]:
+        """Find the config set folders under the base directory."""
+        try:
+            names = os.listdir(self.base_dir)
+        except OSError:
+            return []
+        return [
+            name for name in names
+            if name.startswith(CFG_SET_PREFIX) and os.path.isdir(os.path.join(self.base_dir, name))
+        ]
+
+    def _reload_file(self, config_set: str, filename: str) -> Optional[ConfigEntry]:
+        """Load a single file that is not in the cache yet."""
+        for name in (config_set, filename):
+            if os.path.basename(name) != name:
+                return None
+        if not config_set.startswith(CFG_SET_PREFIX):
+            return None
+        file_path = os.path.join(self.base_dir, config_set, filename)
+        stamp = self._stat(file_path)
+        if stamp is None:
+            return None
+
+        entry = self._parse(file_path, stamp)
+        with self._refresh_lock:
+            updated = dict(self._sets)
+            updated[config_set] = {**updated.get(config_set, {}), filename: entry}
+            self._sets = updated
+            self.version += 1
+        return entry
+
+    @staticmethod
+    def _stat(file_path: str) -> Optional[Tuple[int, int]]:
+        """File stamp used to detect changes, or None if the file is gone."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _parse(file_path: str, stamp: Tuple[int, int]) -> ConfigEntry:
+        """Parse a file, remembering the error for invalid configs."""
+        try:
+            return ConfigEntry(stamp=stamp, test_data=parse_config_file(file_path))
+        except TestPaperGeneratorError as e:
+            return ConfigEntry(stamp=stamp, error=e)
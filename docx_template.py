@@ -0,0 +1,125 @@
+"""
+Preparsed DOCX template engine.
+Builds a styled base document once per process and renders each paper by emitting
+its body XML in one pass into a copy of that template.
+"""
+import io
+import struct
+import zipfile
+import zlib
+from functools import lru_cache
+from typing import List, Tuple, Union
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt
+
+HEADER_PLACEHOLDER = "{{HEADER}}"
+HEADING_STYLE_ID = "Heading1"
+THEME_FONT_ATTRIBUTES = ("w:asciiTheme", "w:hAnsiTheme")
+ZIP_DOS_DATE = (1 << 5) | 1  # 1980-01-01, fixed so identical papers produce identical files
+ZIP_DOS_TIME = 0
+
+
+class _ZipEntry:
+    """A zip member kept in deflated form so it can be copied without recompressing."""
+
+    __slots__ = ("name", "crc", "size", "data")
+
+    def __init__(self, name: str, content: bytes):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        self.name = name.encode("utf-8")
+        self.crc = zlib.crc32(content)
+        self.size = len(content)
+        self.data = compressor.compress(content) + compressor.flush()
+
+
+class DocxTemplate:
+    """A styled base document with font, size, margins and header baked in."""
+
+    def __init__(self, font_name: str, font_size: int, margin_inches: float):
+        doc = Document()
+        for style_name in ("Normal", "Heading 1"):
+            self._bake_font(doc.styles[style_name], font_name, font_size)
+
+        for section in doc.sections:
+            section.top_margin = Inches(margin_inches)
+            section.bottom_margin = Inches(margin_inches)
+            section.left_margin = Inches(margin_inches)
+            section.right_margin = Inches(margin_inches)
+        doc.sections[0].header.paragraphs[0].text = HEADER_PLACEHOLDER
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+
+        self._entries: List[Union[_ZipEntry, str]] = []
+        with zipfile.ZipFile(buffer) as package:
+            for name in package.namelist():
+                content = package.read(name)
+                if name == "word/document.xml":
+                    xml = content.decode("utf-8")
+                    body_end = xml.index("<w:sectPr", xml.index("<w:body>"))
+                    self._document_prefix = xml[:body_end]
+                    self._document_suffix = xml[body_end:]
+                    self._document_name = name
+                    self._entries.append(name)
+                elif HEADER_PLACEHOLDER.encode() in content:
+                    xml = content.decode("utf-8")
+                    self._header_prefix, self._header_suffix = xml.split(HEADER_PLACEHOLDER)
+                    self._header_name = name
+                    self._entries.append(name)
+                else:
+                    self._entries.append(_ZipEntry(name, content))
+
+    def render(self, lines: List[Tuple[str, str]], header_text: str) -> bytes:
+        """Render (kind, text) lines and a header into a complete DOCX package."""
+        body = "".join(
+            f'<w:p><w:pPr><w:pStyle w:val="{HEADING_STYLE_ID}"/></w:pPr>'
+            f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+            if kind == "heading" else
+            f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+            for kind, text in lines
+        )
+        dynamic = {
+            self._document_name: self._document_prefix + body + self._document_suffix,
+            self._header_name: self._header_prefix + escape(header_text) + self._header_suffix,
+        }
+        entries = [
+            entry if isinstance(entry, _ZipEntry) else _ZipEntry(entry, dynamic[entry].encode("utf-8"))
+            for entry in self._entries
+        ]
+        return self._write_zip(entries)
+
+    @staticmethod
+    def _bake_font(style, font_name: str, font_size: int) -> None:
+        """Set the style font explicitly, dropping theme fonts that would override it."""
+        style.font.name = font_name
+        style.font.size = Pt(font_size)
+        r_fonts = style.element.rPr.rFonts
+        for attribute in THEME_FONT_ATTRIBUTES:
+            r_fonts.attrib.pop(qn(attribute), None)
+
+    @staticmethod
+    def _write_zip(entries: List[_ZipEntry]) -> bytes:
+        """Assemble already-deflated members into a zip archive."""
+        output = bytearray()
+        central = bytearray()
+        for entry in entries:
+            offset = len(output)
+            fields = (20, 0, zipfile.ZIP_DEFLATED, ZIP_DOS_TIME, ZIP_DOS_DATE,
+                      entry.crc, len(entry.data), entry.size, len(entry.name))
+            output += struct.pack("<4s5H3I2H", b"PK\x03\x04", *fields, 0)
+            output += entry.name + entry.data
+            central += struct.pack("<4s6H3I5H2I", b"PK\x01\x02", 20, *fields, 0, 0, 0, 0, 0, offset)
+            central += entry.name
+        output += central
+        output += struct.pack("<4s4H2IH", b"PK\x05\x06", 0, 0, len(entries), len(entries),
+                              len(central), len(output) - len(central), 0)
+        return bytes(output)
+
+
+@lru_cache(maxsize=None)
+def get_docx_template(font_name: str, font_size: int, margin_inches: float) -> DocxTemplate:
+    """Build the styled template for one formatting combination once per process."""
+    return DocxTemplate(font_name, font_size, margin_inches)
@@ -31,4 +31,18 @@ class DocumentGenerationError(TestPaperGeneratorError):
 
 class GUIError(TestPaperGeneratorError):
     """Raised when GUI operations fail."""
-    pass
\ No newline at end of file
+    pass
+
+class QueueFullError(TestPaperGeneratorError):
+    """Raised when the generation job queue has no free slots."""
+    pass
+
+
+class PdfConversionError(TestPaperGeneratorError):
+    """Raised when converting a document to PDF fails."""
+    pass
+
+
+class ProfilerBusyError(TestPaperGeneratorError):
+    """Raised when a profile is requested while another one is running."""
+    pass
@@ -0,0 +1,161 @@
+"""
+SQLite catalog of generated papers.
+Records every paper served with its config, seed and files, so history listings and
+downloads by file id are index lookups instead of output folder scans.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from models import GeneratedFiles
+from variables import OUTPUT_FOLDER
+
+CATALOG_FILENAME = ".catalog.sqlite3"  # Hidden, so the output janitor leaves it alone
+FILE_ROLES = ("test", "ans")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    config TEXT NOT NULL,
+    config_set TEXT,
+    seed TEXT,
+    format TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY,
+    paper_id INTEGER NOT NULL REFERENCES papers(id),
+    role TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    removed_at REAL
+);
+CREATE INDEX IF NOT EXISTS papers_created_at ON papers(created_at);
+CREATE INDEX IF NOT EXISTS papers_config ON papers(config, id);
+CREATE INDEX IF NOT EXISTS papers_config_set ON papers(config_set, id);
+CREATE INDEX IF NOT EXISTS papers_seed ON papers(seed, id);
+CREATE INDEX IF NOT EXISTS files_paper_id ON files(paper_id);
+CREATE INDEX IF NOT EXISTS files_filename ON files(filename);
+"""
+
+
+class GenerationCatalog:
+    """Thread-safe catalog of generated papers in a WAL-mode SQLite database."""
+
+    def __init__(self, output_folder: str = OUTPUT_FOLDER, db_path: Optional[str] = None):
+        self.output_folder = output_folder
+        self.db_path = db_path or os.path.join(output_folder, CATALOG_FILENAME)
+        # sqlite3 connections must stay on the thread that created them; the database is created
+        # by the first connection, so building a catalog writes nothing
+        self._local = threading.local()
+
+    def record(self, generated: GeneratedFiles, config: str, config_set: Optional[str],
+               format: str) -> Dict[str, str]:
+        """Record a generated paper and return the file ids of its test and answer files."""
+        filenames = {
+            "test": os.path.basename(generated.test_file_path),
+            "ans": os.path.basename(generated.answer_file_path),
+        }
+        file_ids = {role: uuid.uuid4().hex for role in FILE_ROLES}
+        seed = None if generated.seed is None else str(generated.seed)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO papers (created_at, config, config_set, seed, format) VALUES (?, ?, ?, ?, ?)",
+                (time.time(), config, config_set, seed, format),
+            )
+            for role in FILE_ROLES:
+                conn.execute(
+                    "INSERT INTO files (file_id, paper_id, role, filename) VALUES (?, ?, ?, ?)",
+                    (file_ids[role], cursor.lastrowid, role, filenames[role]),
+                )
+                # A cache hit can bring back a file that was cleaned up earlier
+                conn.execute("UPDATE files SET removed_at = NULL WHERE filename = ?", (filenames[role],))
+        return file_ids
+
+    def resolve(self, file_id: str) -> Optional[Dict[str, object]]:
+        """Look up a file by id, returning its filename, path and removal time."""
+        row = self._connect().execute(
+            "SELECT filename, removed_at FROM files WHERE file_id = ?", (file_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "filename": row["filename"],
+            "path": os.path.join(self.output_folder, row["filename"]),
+            "removed_at": row["removed_at"],
+        }
+
+    def history(self, limit: int = 50, before_id: Optional[int] = None, config: Optional[str] = None,
+                config_set: Optional[str] = None, seed: Optional[int] = None,
+                format: Optional[str] = None, since: Optional[float] = None,
+                until: Optional[float] = None) -> List[Dict[str, object]]:
+        """List recorded papers newest first, filtered and paged by paper id."""
+        clauses = []
+        params: List[object] = []
+        for column, value in (("config", config), ("config_set", config_set), ("format", format)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if seed is not None:
+            clauses.append("seed = ?")
+            params.append(str(seed))
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._connect()
+        papers = [
+            dict(row) for row in conn.execute(
+                f"SELECT id, created_at, config, config_set, seed, format FROM papers {where} "
+                "ORDER BY id DESC LIMIT ?",
+                (*params, limit),
+            )
+        ]
+        if not papers:
+            return papers
+
+        by_id = {paper["id"]: paper for paper in papers}
+        placeholders = ",".join("?" * len(by_id))
+        for row in conn.execute(
+            f"SELECT file_id, paper_id, role, filename, removed_at FROM files WHERE paper_id IN ({placeholders})",
+            tuple(by_id),
+        ):
+            by_id[row["paper_id"]][row["role"]] = {
+                "file_id": row["file_id"],
+                "filename": row["filename"],
+                "available": row["removed_at"] is None,
+            }
+        for paper in papers:
+            paper["seed"] = None if paper["seed"] is None else int(paper["seed"])
+        return papers
+
+    def mark_removed(self, filenames: Iterable[str]) -> None:
+        """Flag files deleted from the output folder so history shows them as unavailable."""
+        removed_at = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE files SET removed_at = ? WHERE filename = ? AND removed_at IS NULL",
+                [(removed_at, filename) for filename in filenames],
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open, or reuse, this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
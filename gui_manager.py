@@ -5,7 +5,7 @@ Handles user interface logic separately from business logic.
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Tuple
 
 try:
     from PIL import Image
@@ -14,9 +14,13 @@ except ImportError:
     PIL_AVAILABLE = False
 
 from interfaces import GUIManagerInterface, IconManagerInterface
-from exceptions import GUIError
+from exceptions import GUIError, QueueFullError
+from job_executor import Job, JobExecutor
 from variables import BASE_DIR
 
+POLL_INTERVAL_MS = 100  # How often the window picks up finished papers
+MAX_QUEUED_JOBS = 1000  # Papers that can wait for the generation worker at once
+
 
 class IconManager(IconManagerInterface):
     """Manages application icon setup for GUI windows."""
@@ -88,12 +92,20 @@ class GUIManager(GUIManagerInterface):
     def __init__(self, 
                  available_files_callback: Callable[[], list],
                  generate_callback: Callable[[str, bool], None],
-                 icon_manager: IconManagerInterface):
+                 icon_manager: IconManagerInterface,
+                 executor: Optional[JobExecutor] = None):
         self.available_files_callback = available_files_callback
         self.generate_callback = generate_callback
         self.icon_manager = icon_manager
+        # A single worker thread generates queued papers in order, off the Tk main thread
+        self.executor = executor or JobExecutor(max_workers=1, max_queue=MAX_QUEUED_JOBS)
         self.root: Optional[tk.Tk] = None
-        self.folder_var: Optional[tk.StringVar] = None
+        self.file_listbox: Optional[tk.Listbox] = None
+        self.progress_bar: Optional[ttk.Progressbar] = None
+        self.status_var: Optional[tk.StringVar] = None
+        self.cancel_button: Optional[ttk.Button] = None
+        # Jobs of the current batch in queue order; cleared once all of them have finished
+        self._jobs: List[Tuple[str, Job]] = []
     
     def run_gui(self) -> None:
         """Run the graphical user interface."""
@@ -109,8 +121,9 @@ class GUIManager(GUIManagerInterface):
         """Create and configure the main window."""
         self.root = tk.Tk()
         self.root.title("Word Test Paper Generator")
-        self.root.geometry("400x300")
+        self.root.geometry("420x520")
         self.root.option_add("*Font", "Arial 16")
+        self.root.protocol("WM_DELETE_WINDOW", self._handle_close)
     
     def _setup_window_properties(self) -> None:
         """Setup window properties including icon."""
@@ -123,32 +136,59 @@ class GUIManager(GUIManagerInterface):
         # File selection
         self._create_file_selection_widgets()
         
+        # Progress of queued papers
+        self._create_progress_widgets()
+        
         # Buttons
         self._create_button_widgets()
     
     def _create_file_selection_widgets(self) -> None:
-        """Create file selection dropdown and label."""
-        self.folder_var = tk.StringVar()
-        
-        folder_label = ttk.Label(self.root, text="Select file:")
+        """Create the file list, which allows selecting several files at once."""
+        folder_label = ttk.Label(self.root, text="Select files (Ctrl/Shift for several):")
         folder_label.pack(pady=5)
         
-        folder_dropdown = ttk.Combobox(self.root, textvariable=self.folder_var)
-        folder_dropdown.pack(pady=5)
+        list_frame = ttk.Frame(self.root)
+        list_frame.pack(pady=5, fill="both", expand=True, padx=20)
         
-        # Populate dropdown with available files
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
+        self.file_listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED, height=8,
+                                       exportselection=False, yscrollcommand=scrollbar.set)
+        scrollbar.configure(command=self.file_listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.file_listbox.pack(side="left", fill="both", expand=True)
+        
+        # Populate list with available files
         try:
-            files = self.available_files_callback()
-            folder_dropdown["values"] = files
+            for filename in self.available_files_callback():
+                self.file_listbox.insert(tk.END, filename)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load available files: {e}")
     
+    def _create_progress_widgets(self) -> None:
+        """Create the progress bar and status line of the generation queue."""
+        self.progress_bar = ttk.Progressbar(self.root, mode="determinate")
+        self.progress_bar.pack(pady=5, fill="x", padx=20)
+        
+        self.status_var = tk.StringVar(value="Ready")
+        status_label = ttk.Label(self.root, textvariable=self.status_var)
+        status_label.pack(pady=5)
+    
     def _create_button_widgets(self) -> None:
         """Create action buttons."""
         # Configure button style
         style = ttk.Style()
         style.configure("TButton", font=("Arial", 14))
         
+        # Cancel button, enabled while papers are queued
+        self.cancel_button = ttk.Button(
+            self.root,
+            text="Cancel",
+            command=self._handle_cancel,
+            style="TButton"
+        )
+        self.cancel_button.pack(side="bottom", pady=10)
+        self.cancel_button.state(["disabled"])
+        
         # Generate button
         generate_button = ttk.Button(
             self.root,
@@ -168,17 +208,68 @@ class GUIManager(GUIManagerInterface):
         generate_print_button.pack(side="right", padx=20)
     
     def _handle_generate(self, print_file: bool = False) -> None:
-        """Handle generate button click."""
-        if not self.folder_var:
+        """Queue the selected files for generation on the worker thread."""
+        if not self.file_listbox:
             messagebox.showerror("Error", "GUI not properly initialized")
             return
         
-        selected_file = self.folder_var.get()
-        if not selected_file:
+        selected_files = [self.file_listbox.get(index) for index in self.file_listbox.curselection()]
+        if not selected_files:
             messagebox.showerror("Error", "Please select a file")
             return
         
-        try:
-            self.generate_callback(selected_file, print_file)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to generate file: {e}")
\ No newline at end of file
+        start_polling = not self._jobs
+        for filename in selected_files:
+            try:
+                job = self.executor.submit(self.generate_callback, filename, print_file)
+            except QueueFullError as e:
+                messagebox.showerror("Error", f"Failed to queue {filename}: {e}")
+                break
+            self._jobs.append((filename, job))
+        
+        if self._jobs and start_polling:
+            self.cancel_button.state(["!disabled"])
+            self.root.after(POLL_INTERVAL_MS, self._poll_jobs)
+        self._update_progress()
+    
+    def _handle_cancel(self) -> None:
+        """Cancel every queued paper; the one being generated still finishes."""
+        cancelled = sum(self.executor.cancel(job.job_id) for _, job in self._jobs)
+        self.status_var.set(f"Cancelled {cancelled} queued papers")
+    
+    def _handle_close(self) -> None:
+        """Drop queued papers and close the window without waiting for the running one."""
+        self.executor.shutdown(wait=False)
+        self.root.destroy()
+    
+    def _poll_jobs(self) -> None:
+        """Pick up finished jobs on the Tk main thread until the batch is complete."""
+        if any(not job.future.done() for _, job in self._jobs):
+            self._update_progress()
+            self.root.after(POLL_INTERVAL_MS, self._poll_jobs)
+            return
+        
+        self._update_progress()
+        failures = [(filename, job.future.exception()) for filename, job in self._jobs
+                    if job.status == "failed"]
+        self._jobs = []
+        self.cancel_button.state(["disabled"])
+        if failures:
+            messagebox.showerror(
+                "Error",
+                "Failed to generate file:\n" + "\n".join(f"{filename}: {error}" for filename, error in failures)
+            )
+    
+    def _update_progress(self) -> None:
+        """Show how many papers of the batch are finished and which one is being generated."""
+        statuses = [job.status for _, job in self._jobs]
+        finished = sum(status in ("done", "failed", "cancelled") for status in statuses)
+        self.progress_bar.configure(maximum=max(1, len(statuses)), value=finished)
+        running = [filename for filename, job in self._jobs if job.status == "running"]
+        if running:
+            self.status_var.set(f"Generating {running[0]} ({finished}/{len(statuses)} done)")
+        elif statuses:
+            counts = ", ".join(f"{statuses.count(status)} {status}"
+                               for status in ("done", "failed", "cancelled") if statuses.count(status))
+            self.status_var.set(f"Finished: {counts}" if finished == len(statuses) else
+                                f"Queued {len(statuses) - finished} papers")
@@ -3,21 +3,26 @@ Abstract interfaces for the Word Test Paper Generator.
 These interfaces define contracts for different components following SOLID principles.
 """
 from abc import ABC, abstractmethod
-from typing import List
-from models import TestData, TestPaperConfig, GeneratedFiles
+from typing import List, Optional, Tuple
+from models import TestData, TestPaperConfig, GeneratedFiles, RenderedPaper
 
 
 class ConfigLoaderInterface(ABC):
     """Interface for loading test configuration data."""
     
     @abstractmethod
-    def load_config(self, filename: str) -> TestData:
-        """Load test data from configuration file."""
+    def load_config(self, filename: str, config_set: Optional[str] = None) -> TestData:
+        """Load test data from a configuration file of the given (or default) config set."""
         pass
     
     @abstractmethod
-    def get_available_files(self) -> List[str]:
-        """Get list of available configuration files."""
+    def get_available_files(self, config_set: Optional[str] = None) -> List[str]:
+        """Get list of available configuration files of the given (or default) config set."""
+        pass
+    
+    @abstractmethod
+    def get_config_sets(self) -> List[str]:
+        """Get list of available config sets."""
         pass
 
 
@@ -28,6 +33,15 @@ class DocumentGeneratorInterface(ABC):
     def generate_test_paper(self, test_data: TestData, config: TestPaperConfig) -> GeneratedFiles:
         """Generate test paper and answer sheet."""
         pass
+    
+    def generate_test_papers(self, variants: List[TestData], config: TestPaperConfig) -> List[GeneratedFiles]:
+        """Generate one test paper and answer sheet per shuffled variant."""
+        return [self.generate_test_paper(variant, config) for variant in variants]
+    
+    @abstractmethod
+    def render_test_paper(self, test_data: TestData, config: TestPaperConfig) -> RenderedPaper:
+        """Render test paper and answer sheet into memory without touching the output folder."""
+        pass
 
 
 class FileManagerInterface(ABC):
@@ -38,6 +52,12 @@ class FileManagerInterface(ABC):
         """Get a unique filename to avoid conflicts."""
         pass
     
+    @abstractmethod
+    def reserve_test_filenames(self, base_filename: str, count: int = 1,
+                               extension: str = ".docx") -> List[Tuple[str, str]]:
+        """Reserve unique (test, answer) filenames for the given number of papers."""
+        pass
+    
     @abstractmethod
     def ensure_output_directory(self) -> None:
         """Ensure output directory exists."""
@@ -48,8 +68,8 @@ class DataShufflerInterface(ABC):
     """Interface for shuffling test data."""
     
     @abstractmethod
-    def shuffle_data(self, test_data: TestData) -> TestData:
-        """Shuffle the test data items randomly."""
+    def shuffle_data(self, test_data: TestData, seed: Optional[int] = None) -> TestData:
+        """Shuffle the test data items randomly, reproducibly when a seed is given."""
         pass
 
 
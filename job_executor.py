@@ -0,0 +1,120 @@
+"""
+Bounded background executor for generation jobs.
+Keeps blocking document rendering and PDF conversion off the web server's event loop.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from exceptions import QueueFullError
+
+
+@dataclass
+class Job:
+    """State of a single submitted generation job."""
+    job_id: str
+    future: Future
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        """Current job status: queued, running, done, failed or cancelled."""
+        if self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running" if self.started_at is not None else "queued"
+        return "failed" if self.future.exception() is not None else "done"
+
+
+class JobExecutor:
+    """Runs jobs on a fixed thread pool and rejects work once the queue is full."""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16,
+                 retry_after: int = 5, job_ttl: float = 3600):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.job_ttl = job_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="generation")
+        # One slot per running job plus one per queued job
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """Submit a job, raising QueueFullError when no slot is free."""
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(
+                f"Generation queue is full ({self.max_queue} jobs waiting)"
+            )
+
+        job_id = uuid.uuid4().hex
+        # Register under the lock so the worker always finds its job record
+        with self._lock:
+            try:
+                future = self._executor.submit(self._run, job_id, fn, *args, **kwargs)
+            except Exception:
+                self._slots.release()
+                raise
+            self._prune_finished_jobs()
+            job = Job(job_id=job_id, future=future)
+            self._jobs[job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """Snapshot of the jobs currently tracked, finished ones included until they expire."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def queue_depth(self) -> int:
+        """Number of submitted jobs that have not started running yet."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == "queued")
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet; a running job always finishes."""
+        job = self.get(job_id)
+        if job is None or not job.future.cancel():
+            return False
+        # A cancelled job never reaches _run, so free its slot here
+        job.finished_at = time.time()
+        self._slots.release()
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and release the worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job_id: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Execute a job on a worker thread and record its timing."""
+        job = self.get(job_id)
+        if job is not None:
+            job.started_at = time.time()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            job = self.get(job_id)
+            if job is not None:
+                job.finished_at = time.time()
+            self._slots.release()
+
+    def _prune_finished_jobs(self) -> None:
+        """Forget finished jobs older than the retention period."""
+        cutoff = time.time() - self.job_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
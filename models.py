@@ -2,26 +2,126 @@
 Data models for the Word Test Paper Generator.
 These classes represent the data structures used throughout the application.
 """
+import re
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Sequence, Tuple, Optional
 
+# Tried in order until one finds the word: whole words, then word starts ("solve" in "solved"),
+# then any substring as older configs expect; each with exact case first.
+BLANK_MATCH_RULES = (
+    (r"(?<!\w){}(?!\w)", 0),
+    (r"(?<!\w){}(?!\w)", re.IGNORECASE),
+    (r"(?<!\w){}", 0),
+    (r"(?<!\w){}", re.IGNORECASE),
+    (r"{}", 0),
+)
+OPTIONAL_SUFFIX = re.compile(r"^(.+)\((\w+)\)$")  # "weigh(ed)" stands for "weighed" or "weigh"
 
-@dataclass
+
+def split_blank_segments(text: str, word: str) -> Tuple[str, ...]:
+    """Split text around every occurrence of word; the blanks go between the segments."""
+    forms = [word]
+    suffix_match = OPTIONAL_SUFFIX.match(word)
+    if suffix_match:
+        forms = [suffix_match.group(1) + suffix_match.group(2), suffix_match.group(1)]
+    
+    for rule, flags in BLANK_MATCH_RULES:
+        for form in forms:
+            segments = re.split(rule.format(re.escape(form)), text, flags=flags)
+            if len(segments) > 1:
+                return tuple(sys.intern(segment) for segment in segments)
+    return (text,)
+
+
+@dataclass(frozen=True, slots=True)
 class TestItem:
     """Represents a single test item (either explain or statement type)."""
     text: str
     word: str
+    # Statement text split around the blanked word, computed once when the config is loaded
+    segments: Tuple[str, ...] = ()
+    
+    @classmethod
+    def statement(cls, text: str, word: str) -> "TestItem":
+        """Create a statement item with its blank positions precomputed."""
+        return cls(text=text, word=word, segments=split_blank_segments(text, word))
     
     def validate(self) -> bool:
-        """Validate that the word exists in the text for statement items."""
+        """Validate that the item has both text and word."""
         return bool(self.text and self.word)
+    
+    def has_blank(self) -> bool:
+        """Whether the word was found in the text, so the statement has something to blank."""
+        if self.segments:
+            return len(self.segments) > 1
+        return self.word in self.text
+    
+    def blanked(self, blank: str) -> str:
+        """The text with every occurrence of the word replaced by the blank."""
+        if self.segments:
+            return blank.join(self.segments)
+        return self.text.replace(self.word, blank)
 
 
-@dataclass
+class ShuffledItems(SequenceABC):
+    """Read-only view of shared items in permuted order; shuffling copies only an index array."""
+    
+    __slots__ = ("_items", "_order")
+    
+    def __init__(self, items: Tuple[TestItem, ...], order: array):
+        self._items = items
+        self._order = order
+    
+    @classmethod
+    def permute(cls, items: Sequence[TestItem], rng) -> "ShuffledItems":
+        """Shuffle items with rng; yields the same order as shuffling a copied list would."""
+        if isinstance(items, ShuffledItems):
+            base, order = items._items, list(items._order)
+        else:
+            base, order = tuple(items), list(range(len(items)))
+        rng.shuffle(order)
+        return cls(base, array("H" if len(base) <= 0xFFFF else "I", order))
+    
+    def __len__(self) -> int:
+        return len(self._order)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._items[i] for i in self._order[index])
+        return self._items[self._order[index]]
+    
+    def __iter__(self) -> Iterator[TestItem]:
+        items = self._items
+        return (items[i] for i in self._order)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SequenceABC):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+    
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+    
+    def __reduce__(self):
+        return ShuffledItems, (self._items, self._order)
+
+
+@dataclass(frozen=True, slots=True)
 class TestData:
-    """Contains all test data loaded from configuration."""
-    explain_items: List[TestItem]
-    statement_items: List[TestItem]
+    """Contains all test data loaded from configuration. Immutable so it can be shared between requests."""
+    explain_items: Sequence[TestItem]
+    statement_items: Sequence[TestItem]
+    seed: Optional[int] = None  # Shuffle seed that produced this item order, if shuffled
+    caller_seeded: bool = False  # The seed was chosen by the caller, so asking again reproduces this paper
+    
+    def __post_init__(self):
+        for name in ("explain_items", "statement_items"):
+            items = getattr(self, name)
+            if not isinstance(items, (tuple, ShuffledItems)):
+                object.__setattr__(self, name, tuple(items))
     
     def validate(self) -> bool:
         """Validate all test items."""
@@ -32,7 +132,7 @@ class TestData:
         
         # Validate statement items (word must be in text)
         for item in self.statement_items:
-            if not item.validate() or item.word not in item.text:
+            if not item.validate() or not item.has_blank():
                 return False
         
         return True
@@ -61,4 +161,16 @@ class GeneratedFiles:
     """Information about generated test files."""
     test_file_path: str
     answer_file_path: str
-    base_filename: str
\ No newline at end of file
+    base_filename: str
+    seed: Optional[int] = None  # Shuffle seed; regenerating with it reproduces both files
+
+
+@dataclass(frozen=True)
+class RenderedPaper:
+    """A test paper and answer sheet rendered in memory, never written to disk."""
+    test_filename: str
+    test_content: bytes
+    answer_filename: str
+    answer_content: bytes
+    base_filename: str
+    seed: Optional[int] = None
\ No newline at end of file
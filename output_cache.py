@@ -0,0 +1,238 @@
+"""
+Content-addressed cache of generated output files.
+Identical requests (same config content, seed, formatting and format) reuse earlier files
+instead of rendering or converting them again.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from interfaces import DocumentGeneratorInterface, FileManagerInterface
+from models import GeneratedFiles, RenderedPaper, TestData, TestPaperConfig
+
+MANIFEST_NAME = "manifest.json"
+
+
+def make_cache_key(*parts) -> str:
+    """Hash JSON-serialisable key parts into a cache key."""
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputCache:
+    """Disk cache of output files with a byte budget and least-recently-used eviction."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> entry size in bytes, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        # The cache folder is created by the first store, so building a cache writes nothing
+        self._load_index()
+
+    def restore(self, key: str, target_folder: str) -> Optional[List[str]]:
+        """Place the cached files for a key into the target folder and return their paths."""
+        manifest = self._read_manifest(key)
+        paths = None
+        if manifest is not None:
+            paths = self._restore_files(key, manifest["files"], target_folder)
+
+        with self._lock:
+            if paths is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                # Stored by another process sharing the cache folder
+                self._entries[key] = manifest["size"]
+                self._total_bytes += manifest["size"]
+        self._touch(key)
+        return paths
+
+    def store(self, key: str, paths: List[str]) -> None:
+        """Copy generated files into the cache under a key, evicting old entries if needed."""
+        size = sum(os.path.getsize(path) for path in paths)
+        if size > self.max_bytes:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.cache_dir)
+        try:
+            files = {}
+            for path in paths:
+                name = os.path.basename(path)
+                shutil.copyfile(path, os.path.join(staging, name))
+                files[name] = file_digest(path)
+            with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump({"files": files, "size": size}, f)
+
+            entry_dir = os.path.join(self.cache_dir, key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging, entry_dir)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._counters["stores"] += 1
+            evicted = self._pick_evictions()
+        for old_key in evicted:
+            shutil.rmtree(os.path.join(self.cache_dir, old_key), ignore_errors=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Report hit/miss counters and cache usage."""
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _restore_files(self, key: str, files: Dict[str, str], target_folder: str) -> Optional[List[str]]:
+        """Reuse identical files already in the target folder, copying the rest from the cache."""
+        paths = []
+        for name, digest in files.items():
+            target = os.path.join(target_folder, name)
+            if os.path.exists(target):
+                # The name may since have been reused for a different paper
+                if file_digest(target) != digest:
+                    return None
+            else:
+                try:
+                    with open(os.path.join(self.cache_dir, key, name), "rb") as src, \
+                            open(target, "xb") as dst:
+                        shutil.copyfileobj(src, dst)
+                except FileExistsError:
+                    if file_digest(target) != digest:
+                        return None
+                except OSError:
+                    return None
+            paths.append(target)
+        return paths
+
+    def _pick_evictions(self) -> List[str]:
+        """Drop least recently used entries from the index until within budget."""
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old_size = self._entries.popitem(last=False)
+            self._total_bytes -= old_size
+            self._counters["evictions"] += 1
+            evicted.append(old_key)
+        return evicted
+
+    def _read_manifest(self, key: str) -> Optional[dict]:
+        """Read an entry's manifest, or None if the entry is missing."""
+        try:
+            with open(os.path.join(self.cache_dir, key, MANIFEST_NAME), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _touch(self, key: str) -> None:
+        """Mark an entry as recently used so the order survives restarts."""
+        try:
+            os.utime(os.path.join(self.cache_dir, key, MANIFEST_NAME))
+        except OSError:
+            pass
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from entries already on disk."""
+        found = []
+        if not os.path.isdir(self.cache_dir):
+            return
+        for key in os.listdir(self.cache_dir):
+            if key.startswith("."):
+                shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+                continue
+            manifest_path = os.path.join(self.cache_dir, key, MANIFEST_NAME)
+            manifest = self._read_manifest(key)
+            if manifest is None:
+                continue
+            found.append((os.path.getmtime(manifest_path), key, manifest["size"]))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+
+class CachingDocumentGenerator(DocumentGeneratorInterface):
+    """Serves seeded papers from the output cache and renders only on a miss."""
+
+    def __init__(self, generator: DocumentGeneratorInterface, cache: OutputCache,
+                 file_manager: FileManagerInterface, output_format: str):
+        self.generator = generator
+        self.cache = cache
+        self.file_manager = file_manager
+        self.output_format = output_format
+
+    def generate_test_paper(self, test_data: TestData, config: TestPaperConfig) -> GeneratedFiles:
+        """Return cached files for an identical seeded paper, rendering it otherwise."""
+        return self.generate_test_papers([test_data], config)[0]
+
+    def generate_test_papers(self, variants: List[TestData], config: TestPaperConfig) -> List[GeneratedFiles]:
+        """Serve cache hits and render all misses in one call to the wrapped generator."""
+        base_filename = config.input_filename.split(".")[0]
+        results: List[Optional[GeneratedFiles]] = []
+        misses = []
+        for variant in variants:
+            key = self.cache_key(variant, config)
+            paths = self.cache.restore(key, self.file_manager.output_folder) if key else None
+            if paths is None:
+                results.append(None)
+                misses.append((len(results) - 1, key, variant))
+            else:
+                results.append(GeneratedFiles(
+                    test_file_path=paths[0],
+                    answer_file_path=paths[1],
+                    base_filename=base_filename,
+                    seed=variant.seed
+                ))
+
+        if misses:
+            generated = self.generator.generate_test_papers([variant for _, _, variant in misses], config)
+            for (index, key, _), files in zip(misses, generated):
+                if key:
+                    self.cache.store(key, [files.test_file_path, files.answer_file_path])
+                results[index] = files
+        return results
+
+    def render_test_paper(self, test_data: TestData, config: TestPaperConfig) -> RenderedPaper:
+        """Render into memory; in-memory papers bypass the disk cache."""
+        return self.generator.render_test_paper(test_data, config)
+
+    def cache_key(self, test_data: TestData, config: TestPaperConfig) -> Optional[str]:
+        """Key on config content, seed, formatting and format; papers the caller did not seed are never cached."""
+        # A random paper is never requested again, so caching it would only evict reusable entries
+        if not test_data.caller_seeded:
+            return None
+        config_hash = make_cache_key(
+            [(item.text, item.word) for item in test_data.explain_items],
+            [(item.text, item.word, item.segments) for item in test_data.statement_items],
+        )
+        return make_cache_key(
+            config_hash, test_data.seed, config.input_filename.split(".")[0],
+            config.font_name, config.font_size, config.margin_inches, list(config.headings),
+            self.output_format,
+        )
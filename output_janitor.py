@@ -0,0 +1,153 @@
+"""
+Retention for the output folder.
+Deletes generated files that are too old, or the least recently downloaded ones once the folder
+exceeds its size or file count budget.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from variables import OUTPUT_FOLDER
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Budgets for the output folder; None disables a limit."""
+    max_bytes: Optional[int] = 1024 * 1024 * 1024
+    max_age_seconds: Optional[float] = 30 * 24 * 3600
+    max_files: Optional[int] = 5000
+    min_age_seconds: float = 600  # Files this new may still be being written or fetched
+
+
+class OutputJanitor:
+    """Enforces a retention policy on the output folder, once or periodically."""
+
+    def __init__(self, output_folder: str = OUTPUT_FOLDER, policy: RetentionPolicy = RetentionPolicy(),
+                 interval: float = 600, in_use: Optional[Callable[[], Set[str]]] = None,
+                 on_removed: Optional[Callable[[List[str]], None]] = None):
+        self.output_folder = output_folder
+        self.policy = policy
+        self.interval = interval
+        # Returns the filenames still referenced by unfinished or unfetched jobs
+        self.in_use = in_use or set
+        # Told which filenames a pass deleted, e.g. to update the generation catalog
+        self.on_removed = on_removed
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, float] = {
+            "runs": 0,
+            "removed_files": 0,
+            "reclaimed_bytes": 0,
+            "last_run_at": 0,
+            "last_removed_files": 0,
+            "last_reclaimed_bytes": 0,
+            "files": 0,
+            "bytes": 0,
+        }
+
+    def collect(self) -> Dict[str, int]:
+        """Run one retention pass and report what it removed."""
+        now = time.time()
+        files = self._scan()
+        protected = self.in_use()
+        total_bytes = sum(size for _, size, _ in files)
+        total_files = len(files)
+        removed_names = []
+        reclaimed_bytes = 0
+
+        # Least recently used first
+        for last_used, size, name in sorted(files):
+            age = now - last_used
+            too_old = self.policy.max_age_seconds is not None and age > self.policy.max_age_seconds
+            over_size = self.policy.max_bytes is not None and total_bytes > self.policy.max_bytes
+            over_count = self.policy.max_files is not None and total_files > self.policy.max_files
+            if not (too_old or over_size or over_count):
+                continue
+            if age < self.policy.min_age_seconds or name in protected:
+                continue
+            try:
+                os.remove(os.path.join(self.output_folder, name))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Still open, e.g. being downloaded on Windows
+                continue
+            total_bytes -= size
+            total_files -= 1
+            removed_names.append(name)
+            reclaimed_bytes += size
+
+        removed_files = len(removed_names)
+        if removed_names and self.on_removed is not None:
+            self.on_removed(removed_names)
+
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["removed_files"] += removed_files
+            self._stats["reclaimed_bytes"] += reclaimed_bytes
+            self._stats["last_run_at"] = now
+            self._stats["last_removed_files"] = removed_files
+            self._stats["last_reclaimed_bytes"] = reclaimed_bytes
+            self._stats["files"] = total_files
+            self._stats["bytes"] = total_bytes
+        return {"removed_files": removed_files, "reclaimed_bytes": reclaimed_bytes,
+                "files": total_files, "bytes": total_bytes}
+
+    def mark_downloaded(self, file_path: str) -> None:
+        """Record a download in the file's access time, which orders eviction."""
+        try:
+            os.utime(file_path, (time.time(), os.stat(file_path).st_mtime))
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """Report totals across all runs and the result of the last one."""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self) -> None:
+        """Run retention passes in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="output-janitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Collect until asked to stop."""
+        while True:
+            try:
+                self.collect()
+            except Exception as e:
+                print(f"Warning: Output cleanup failed: {e}")
+            if self._stop_event.wait(self.interval):
+                return
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """List (last used, size, name) of generated files, skipping hidden cache and counter folders."""
+        files = []
+        try:
+            entries = list(os.scandir(self.output_folder))
+        except OSError:
+            return files
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((max(stat.st_atime, stat.st_mtime), stat.st_size, entry.name))
+        return files
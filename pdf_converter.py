@@ -0,0 +1,206 @@
+"""
+Long-lived pool of PDF converter workers.
+Workers are started once, take conversion jobs from a shared queue and run them in parallel.
+"""
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from exceptions import PdfConversionError
+
+
+@dataclass
+class ConversionJob:
+    """A single DOCX to PDF conversion waiting in the queue."""
+    input_path: str
+    output_path: str
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class PdfConverterPool:
+    """Converts DOCX files to PDF with a fixed set of pandoc worker threads."""
+
+    def __init__(self, workers: int = 2, timeout: float = 60,
+                 command: Sequence[str] = ("pandoc",)):
+        self.workers = workers
+        self.timeout = timeout
+        self.command = list(command)
+        self._queue: "queue.Queue[Optional[ConversionJob]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._started = False
+        self._counters: Dict[str, int] = {
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "restarts": 0,
+        }
+
+    def start(self) -> None:
+        """Start the workers and check that the converter can be launched."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for index in range(self.workers):
+                self._threads.append(self._spawn_worker(index))
+        self._warm_up()
+
+    def shutdown(self) -> None:
+        """Stop all workers after the jobs already queued."""
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout=self.timeout)
+
+    def submit(self, input_path: str) -> Future:
+        """Queue one DOCX file for conversion and return a future for the PDF path."""
+        if not input_path.lower().endswith(".docx"):
+            raise PdfConversionError(f"Input file is not a DOCX: {input_path}")
+        self.start()
+        self._restart_dead_workers()
+
+        job = ConversionJob(
+            input_path=input_path,
+            output_path=os.path.splitext(input_path)[0] + ".pdf",
+        )
+        self._queue.put(job)
+        return job.future
+
+    def convert(self, input_path: str) -> str:
+        """Convert a single file, blocking until it finishes."""
+        return self.convert_many([input_path])[0]
+
+    def convert_many(self, input_paths: Sequence[str]) -> List[str]:
+        """Convert several files in parallel, blocking until all finish."""
+        futures = [self.submit(path) for path in input_paths]
+        deadline = time.monotonic() + self.timeout
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeoutError:
+                # Running jobs are stopped and counted by the worker's own timeout
+                if future.cancel():
+                    self._count("timed_out")
+                raise PdfConversionError(f"PDF conversion timed out after {self.timeout}s")
+        return results
+
+    def convert_documents(self, documents: Sequence[Tuple[str, bytes]]) -> List[bytes]:
+        """Convert in-memory (filename, DOCX bytes) documents, returning the PDF bytes."""
+        # Pandoc needs real files; they live in the system temp folder, never in the output folder
+        with tempfile.TemporaryDirectory(prefix="pdf-convert-") as folder:
+            input_paths = []
+            for filename, content in documents:
+                input_path = os.path.join(folder, os.path.basename(filename))
+                with open(input_path, "wb") as f:
+                    f.write(content)
+                input_paths.append(input_path)
+
+            results = []
+            for output_path in self.convert_many(input_paths):
+                with open(output_path, "rb") as f:
+                    results.append(f.read())
+            return results
+
+    def stats(self) -> Dict[str, int]:
+        """Report queue depth, worker utilisation and job counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "workers": sum(1 for thread in self._threads if thread.is_alive()),
+                "busy_workers": self._busy,
+                **self._counters,
+            }
+
+    def _spawn_worker(self, index: int) -> threading.Thread:
+        """Create and start one worker thread."""
+        thread = threading.Thread(
+            target=self._worker_loop,
+            name=f"pdf-converter-{index}",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _restart_dead_workers(self) -> None:
+        """Replace any worker thread that has crashed."""
+        with self._lock:
+            if not self._started:
+                return
+            for index, thread in enumerate(self._threads):
+                if not thread.is_alive():
+                    self._threads[index] = self._spawn_worker(index)
+                    self._counters["restarts"] += 1
+
+    def _warm_up(self) -> None:
+        """Launch the converter once so a missing install is reported at startup."""
+        try:
+            subprocess.run(self.command + ["--version"], check=True,
+                           capture_output=True, timeout=self.timeout)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Warning: PDF converter is not available: {e}")
+
+    def _worker_loop(self) -> None:
+        """Take jobs from the queue until a stop marker arrives."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            with self._lock:
+                self._busy += 1
+            try:
+                self._convert(job)
+            except PdfConversionError as e:
+                self._count("failed")
+                job.future.set_exception(e)
+            except BaseException as e:
+                # Fail the job, then let the thread die so the pool restarts it
+                self._count("failed")
+                job.future.set_exception(PdfConversionError(f"PDF converter crashed: {e}"))
+                raise
+            else:
+                self._count("completed")
+                job.future.set_result(job.output_path)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+    def _convert(self, job: ConversionJob) -> None:
+        """Run the converter for one job within the remaining time budget."""
+        remaining = self.timeout - (time.monotonic() - job.enqueued_at)
+        if remaining <= 0:
+            self._count("timed_out")
+            raise PdfConversionError("PDF conversion timed out while queued")
+        try:
+            subprocess.run(self.command + [job.input_path, "-o", job.output_path],
+                           check=True, capture_output=True, timeout=remaining)
+        except FileNotFoundError:
+            raise PdfConversionError("Pandoc not found. Please install pandoc.")
+        except subprocess.TimeoutExpired:
+            self._count("timed_out")
+            raise PdfConversionError(f"PDF conversion timed out after {self.timeout}s")
+        except subprocess.CalledProcessError as e:
+            raise PdfConversionError(f"Pandoc conversion failed: {e}")
+
+    def _count(self, counter: str) -> None:
+        """Increment one of the job counters."""
+        with self._lock:
+            self._counters[counter] += 1
@@ -0,0 +1,359 @@
+"""
+Direct-to-PDF document generator.
+Renders test papers straight from TestData, without an intermediate DOCX or an external converter.
+"""
+import os
+import struct
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from interfaces import DocumentGeneratorInterface, FileManagerInterface
+from models import TestData, TestPaperConfig, GeneratedFiles, RenderedPaper
+from exceptions import DocumentGenerationError
+from metrics import BYTES_WRITTEN, stage_timer
+from services import build_header_text, build_memory_filenames, build_paper_lines
+from variables import BASE_DIR
+
+# Folders searched for TrueType fonts, the project's own fonts/ folder first
+FONT_SEARCH_DIRS = [
+    os.path.join(BASE_DIR, "fonts"),
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+    os.path.expanduser("~/Library/Fonts"),
+    "/Library/Fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+]
+
+# Known file names for font families whose file name differs from the family name
+FONT_FILE_NAMES = {
+    "comic sans ms": ["comic.ttf", "Comic Sans MS.ttf", "ComicSansMS.ttf"],
+    "arial": ["arial.ttf", "Arial.ttf"],
+    "times new roman": ["times.ttf", "Times New Roman.ttf"],
+}
+
+# Used when the configured font is not installed
+FALLBACK_FONT_FILES = ["DejaVuSans.ttf", "LiberationSans-Regular.ttf", "arial.ttf", "Arial.ttf"]
+
+PAGE_WIDTH = 612  # US Letter in points, the python-docx default template page size
+PAGE_HEIGHT = 792
+HEADER_DISTANCE = 36  # 0.5 inch, the python-docx default header distance
+HEADER_FONT_SIZE = 10
+HEADING_COLOR = (0.184, 0.329, 0.588)  # Heading 1 colour of the python-docx default template
+LINE_SPACING = 1.5
+TEXT_ENCODING = "cp1252"  # Matches the WinAnsiEncoding declared for the embedded font
+
+
+@lru_cache(maxsize=None)
+def find_font_file(font_name: str) -> Optional[str]:
+    """Locate a TrueType file for the font family, or a fallback font."""
+    candidates = FONT_FILE_NAMES.get(font_name.lower(), []) + [
+        f"{font_name}.ttf",
+        f"{font_name.replace(' ', '')}.ttf",
+    ]
+    for names in (candidates, FALLBACK_FONT_FILES):
+        wanted = {name.lower() for name in names}
+        for folder in FONT_SEARCH_DIRS:
+            if not os.path.isdir(folder):
+                continue
+            for root, _, files in os.walk(folder):
+                for filename in files:
+                    if filename.lower() in wanted:
+                        return os.path.join(root, filename)
+    return None
+
+
+class TrueTypeFont:
+    """Metrics and compressed font program of a TrueType file, ready for PDF embedding."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] not in (b"\x00\x01\x00\x00", b"true"):
+            raise DocumentGenerationError(f"Not a TrueType font file: {path}")
+
+        tables = self._read_table_directory(data)
+        units_per_em, x_min, y_min, x_max, y_max = struct.unpack(
+            ">H16xhhhh", data[tables["head"] + 18:tables["head"] + 44]
+        )
+        ascent, descent = struct.unpack(">hh", data[tables["hhea"] + 4:tables["hhea"] + 8])
+        num_h_metrics = struct.unpack(">H", data[tables["hhea"] + 34:tables["hhea"] + 36])[0]
+        advances = struct.unpack(
+            f">{num_h_metrics * 2}H", data[tables["hmtx"]:tables["hmtx"] + num_h_metrics * 4]
+        )[::2]
+        glyph_ids = self._read_cmap(data, tables["cmap"])
+
+        def scale(value: int) -> int:
+            return round(value * 1000 / units_per_em)
+
+        self.bbox = tuple(scale(v) for v in (x_min, y_min, x_max, y_max))
+        self.ascent = scale(ascent)
+        self.descent = scale(descent)
+        self.cap_height = self.ascent
+        if "OS/2" in tables:
+            os2 = tables["OS/2"]
+            version = struct.unpack(">H", data[os2:os2 + 2])[0]
+            if version >= 2:
+                self.cap_height = scale(struct.unpack(">h", data[os2 + 88:os2 + 90])[0])
+
+        # Widths of the 8-bit character codes, in 1/1000 em
+        self.widths: List[int] = []
+        for code in range(256):
+            try:
+                char = bytes([code]).decode(TEXT_ENCODING)
+            except UnicodeDecodeError:
+                self.widths.append(0)
+                continue
+            glyph = glyph_ids.get(ord(char), 0)
+            self.widths.append(scale(advances[min(glyph, num_h_metrics - 1)]))
+
+        self.postscript_name = "".join(
+            ch for ch in os.path.splitext(os.path.basename(path))[0] if ch.isalnum()
+        )
+        self.original_length = len(data)
+        self.compressed = zlib.compress(data)
+
+    def text_width(self, text: bytes, size: float) -> float:
+        """Width in points of encoded text at the given font size."""
+        return sum(self.widths[code] for code in text) * size / 1000
+
+    @staticmethod
+    def _read_table_directory(data: bytes) -> Dict[str, int]:
+        """Map table tags to their byte offsets."""
+        num_tables = struct.unpack(">H", data[4:6])[0]
+        tables = {}
+        for index in range(num_tables):
+            tag, _, offset, _ = struct.unpack(">4sIII", data[12 + index * 16:28 + index * 16])
+            tables[tag.decode("latin-1")] = offset
+        return tables
+
+    @staticmethod
+    def _read_cmap(data: bytes, cmap: int) -> Dict[int, int]:
+        """Read the Unicode BMP (format 4) character to glyph mapping."""
+        num_subtables = struct.unpack(">H", data[cmap + 2:cmap + 4])[0]
+        for index in range(num_subtables):
+            platform, encoding, offset = struct.unpack(
+                ">HHI", data[cmap + 4 + index * 8:cmap + 12 + index * 8]
+            )
+            subtable = cmap + offset
+            if (platform, encoding) in ((3, 1), (0, 3)) and \
+                    struct.unpack(">H", data[subtable:subtable + 2])[0] == 4:
+                break
+        else:
+            raise DocumentGenerationError("Font has no Unicode character map")
+
+        seg_count = struct.unpack(">H", data[subtable + 6:subtable + 8])[0] // 2
+        ends_at = subtable + 14
+        starts_at = ends_at + seg_count * 2 + 2
+        deltas_at = starts_at + seg_count * 2
+        range_offsets_at = deltas_at + seg_count * 2
+
+        glyph_ids = {}
+        for seg in range(seg_count):
+            end, = struct.unpack(">H", data[ends_at + seg * 2:ends_at + seg * 2 + 2])
+            start, = struct.unpack(">H", data[starts_at + seg * 2:starts_at + seg * 2 + 2])
+            delta, = struct.unpack(">h", data[deltas_at + seg * 2:deltas_at + seg * 2 + 2])
+            range_offset_at = range_offsets_at + seg * 2
+            range_offset, = struct.unpack(">H", data[range_offset_at:range_offset_at + 2])
+            # Only the 8-bit encodable range matters for WinAnsiEncoding text
+            for code in range(start, min(end, 0x2122) + 1):
+                if range_offset == 0:
+                    glyph = (code + delta) & 0xFFFF
+                else:
+                    glyph_at = range_offset_at + range_offset + (code - start) * 2
+                    glyph, = struct.unpack(">H", data[glyph_at:glyph_at + 2])
+                    if glyph:
+                        glyph = (glyph + delta) & 0xFFFF
+                glyph_ids[code] = glyph
+        return glyph_ids
+
+
+@lru_cache(maxsize=None)
+def load_font(font_name: str) -> TrueTypeFont:
+    """Parse the TrueType font for a family once per process."""
+    font_file = find_font_file(font_name)
+    if font_file is None:
+        raise DocumentGenerationError(
+            f"No TrueType font found for '{font_name}'. "
+            f"Place a .ttf file in {FONT_SEARCH_DIRS[0]}"
+        )
+    return TrueTypeFont(font_file)
+
+
+class PdfDocumentGenerator(DocumentGeneratorInterface):
+    """Generates PDF test papers and answer sheets in-process."""
+
+    def __init__(self, file_manager: FileManagerInterface):
+        self.file_manager = file_manager
+
+    def generate_test_paper(self, test_data: TestData, config: TestPaperConfig) -> GeneratedFiles:
+        """Generate test paper and answer sheet PDFs."""
+        try:
+            base_filename = config.input_filename.split(".")[0]
+            test_filename, ans_filename = self.file_manager.reserve_test_filenames(
+                base_filename, extension=".pdf"
+            )[0]
+            test_filepath = os.path.join(self.file_manager.output_folder, test_filename)
+            ans_filepath = os.path.join(self.file_manager.output_folder, ans_filename)
+            test_pdf, ans_pdf = self._render_documents(test_data, config, test_filename, ans_filename)
+
+            with stage_timer("write"):
+                with open(test_filepath, "wb") as f:
+                    f.write(test_pdf)
+                with open(ans_filepath, "wb") as f:
+                    f.write(ans_pdf)
+            BYTES_WRITTEN.inc(len(test_pdf) + len(ans_pdf), format="pdf")
+
+            return GeneratedFiles(
+                test_file_path=test_filepath,
+                answer_file_path=ans_filepath,
+                base_filename=base_filename,
+                seed=test_data.seed
+            )
+
+        except Exception as e:
+            raise DocumentGenerationError(f"Failed to generate PDF documents: {e}")
+
+    def render_test_paper(self, test_data: TestData, config: TestPaperConfig) -> RenderedPaper:
+        """Render test paper and answer sheet PDFs into memory."""
+        try:
+            base_filename = config.input_filename.split(".")[0]
+            test_filename, ans_filename = build_memory_filenames(base_filename, test_data.seed, ".pdf")
+            test_pdf, ans_pdf = self._render_documents(test_data, config, test_filename, ans_filename)
+            return RenderedPaper(
+                test_filename=test_filename,
+                test_content=test_pdf,
+                answer_filename=ans_filename,
+                answer_content=ans_pdf,
+                base_filename=base_filename,
+                seed=test_data.seed
+            )
+
+        except Exception as e:
+            raise DocumentGenerationError(f"Failed to render PDF documents: {e}")
+
+    def _render_documents(self, test_data: TestData, config: TestPaperConfig,
+                          test_filename: str, ans_filename: str) -> Tuple[bytes, bytes]:
+        """Render both PDFs, with the filenames shown in their headers."""
+        font = load_font(config.font_name)
+        with stage_timer("content"):
+            lines = build_paper_lines(test_data, config)
+        with stage_timer("render_pdf"):
+            test_pdf = self._render_pdf([(kind, test) for kind, test, _ in lines], config, font,
+                                        build_header_text(test_filename, test_data.seed))
+            ans_pdf = self._render_pdf([(kind, ans) for kind, _, ans in lines], config, font,
+                                       build_header_text(ans_filename, test_data.seed))
+        return test_pdf, ans_pdf
+
+    def _render_pdf(self, lines: List[Tuple[str, str]], config: TestPaperConfig,
+                    font: TrueTypeFont, header_text: str) -> bytes:
+        """Lay out headings and wrapped numbered lines and serialise the PDF."""
+        margin = config.margin_inches * 72
+        text_width = PAGE_WIDTH - 2 * margin
+        header_y = PAGE_HEIGHT - HEADER_DISTANCE - HEADER_FONT_SIZE
+        # Like Word, push the body below the header when the top margin is smaller
+        top = min(PAGE_HEIGHT - margin, header_y - HEADER_FONT_SIZE)
+        pages: List[List[bytes]] = [[]]
+        y = top
+
+        for kind, text in lines:
+            size = config.font_size + 2 if kind == "heading" else config.font_size
+            leading = size * LINE_SPACING
+            if kind == "heading":
+                y -= config.font_size * 0.5
+            for row in self._wrap(text.encode(TEXT_ENCODING, errors="replace"), font, size, text_width):
+                if y - leading < margin:
+                    pages.append([])
+                    y = top
+                y -= leading
+                color = HEADING_COLOR if kind == "heading" else (0, 0, 0)
+                pages[-1].append(self._text_op(row, margin, y, size, color))
+
+        header = header_text.encode(TEXT_ENCODING, errors="replace")
+        for ops in pages:
+            ops.append(self._text_op(header, margin, header_y, HEADER_FONT_SIZE, (0, 0, 0)))
+        return self._serialise(pages, font)
+
+    @staticmethod
+    def _wrap(text: bytes, font: TrueTypeFont, size: float, max_width: float) -> List[bytes]:
+        """Break encoded text into rows that fit the line width."""
+        rows = []
+        current = b""
+        for word in text.split(b" "):
+            candidate = word if not current else current + b" " + word
+            if current and font.text_width(candidate, size) > max_width:
+                rows.append(current)
+                current = word
+            else:
+                current = candidate
+        rows.append(current)
+        return rows
+
+    @staticmethod
+    def _text_op(text: bytes, x: float, y: float, size: float, color: Tuple[float, ...]) -> bytes:
+        """Content stream operators drawing one row of text."""
+        escaped = text.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        return b"BT %.3f %.3f %.3f rg /F1 %.2f Tf %.2f %.2f Td (%s) Tj ET\n" % (
+            *color, size, x, y, escaped
+        )
+
+    @staticmethod
+    def _serialise(pages: List[List[bytes]], font: TrueTypeFont) -> bytes:
+        """Assemble catalog, page tree, embedded font and page contents into a PDF file."""
+        objects: List[bytes] = []
+
+        def add(body: bytes) -> int:
+            objects.append(body)
+            return len(objects)
+
+        def stream(dictionary: bytes, data: bytes) -> bytes:
+            return b"<< %s /Length %d >>\nstream\n%s\nendstream" % (dictionary, len(data), data)
+
+        catalog = add(b"")
+        page_tree = add(b"")
+        font_file = add(stream(b"/Filter /FlateDecode /Length1 %d" % font.original_length,
+                               font.compressed))
+        descriptor = add(
+            b"<< /Type /FontDescriptor /FontName /%s /Flags 32 /FontBBox [%d %d %d %d] "
+            b"/ItalicAngle 0 /Ascent %d /Descent %d /CapHeight %d /StemV 80 /FontFile2 %d 0 R >>" % (
+                font.postscript_name.encode(), *font.bbox, font.ascent, font.descent,
+                font.cap_height, font_file
+            )
+        )
+        font_object = add(
+            b"<< /Type /Font /Subtype /TrueType /BaseFont /%s /FirstChar 32 /LastChar 255 "
+            b"/Widths [%s] /FontDescriptor %d 0 R /Encoding /WinAnsiEncoding >>" % (
+                font.postscript_name.encode(),
+                b" ".join(b"%d" % width for width in font.widths[32:]),
+                descriptor
+            )
+        )
+
+        page_ids = []
+        for ops in pages:
+            content = add(stream(b"/Filter /FlateDecode", zlib.compress(b"".join(ops))))
+            page_ids.append(add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (
+                    page_tree, PAGE_WIDTH, PAGE_HEIGHT, font_object, content
+                )
+            ))
+        objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+        objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+        )
+
+        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(output))
+            output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref = len(output)
+        output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objects) + 1, catalog, xref
+        )
+        return bytes(output)
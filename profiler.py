@@ -0,0 +1,167 @@
+"""
+On-demand profiling of single generation requests.
+Runs a call under cProfile while a sampler thread records its stacks, then writes a pstats file
+and a collapsed-stack file (one "frame;frame;frame count" line per stack) for flamegraph tools.
+"""
+import cProfile
+import itertools
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from exceptions import ProfilerBusyError
+from variables import OUTPUT_FOLDER
+
+PROFILE_FOLDER = os.path.join(OUTPUT_FOLDER, ".profiles")  # Hidden, so the output janitor leaves it alone
+PROFILE_KINDS = {"pstats": ".pstats", "folded": ".folded"}
+SAMPLE_EVERY_ENV = "PAPER_PROFILE_EVERY"  # Profile 1 in N requests; unset or 0 disables sampling
+
+# From Python 3.12 only one cProfile profiler can be active per process, so profiles never overlap
+_active_profile = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ProfileRecord:
+    """A captured profile and the files it was written to."""
+    profile_id: str
+    label: str
+    created_at: float
+    duration: float
+    samples: int
+    pstats_path: str
+    folded_path: str
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Record the target thread's stack until stopped."""
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{os.path.basename(code.co_filename)}:{code.co_qualname}")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+class Profiler:
+    """Profiles calls on request, or 1 in N of them, and keeps the most recent profiles."""
+
+    def __init__(self, folder: str = PROFILE_FOLDER, sample_every: Optional[int] = None,
+                 keep: int = 20, interval: float = 0.001):
+        self.folder = folder
+        if sample_every is None:
+            value = os.environ.get(SAMPLE_EVERY_ENV, "")
+            sample_every = int(value) if value.isdigit() else 0
+        self.sample_every = sample_every
+        self.keep = keep
+        self.interval = interval
+        self._calls = itertools.count(1)
+        self._records: Deque[ProfileRecord] = deque()
+        self._lock = threading.Lock()
+
+    def should_sample(self) -> bool:
+        """Whether this call is the 1 in N picked for profiling."""
+        return self.sample_every > 0 and next(self._calls) % self.sample_every == 0
+
+    def run(self, label: str, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, ProfileRecord]:
+        """Call fn under the profiler, returning its result and the profile written for it.
+
+        Raises ProfilerBusyError, without calling fn, while another profile is running.
+        """
+        if not _active_profile.acquire(blocking=False):
+            raise ProfilerBusyError("Another profile is already running")
+        try:
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            with StackSampler(threading.get_ident(), self.interval) as sampler:
+                try:
+                    profile.enable()
+                    result = fn(*args, **kwargs)
+                finally:
+                    profile.disable()
+                    duration = time.perf_counter() - start
+                    record = self._write(label, duration, profile, sampler)
+        finally:
+            _active_profile.release()
+        return result, record
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Recent profiles, newest first."""
+        with self._lock:
+            records = list(reversed(self._records))
+        return [
+            {key: value for key, value in asdict(record).items() if not key.endswith("_path")}
+            for record in records
+        ]
+
+    def get_path(self, profile_id: str, kind: str) -> Optional[str]:
+        """Path of one file of a recent profile, or None if unknown."""
+        with self._lock:
+            record = next((r for r in self._records if r.profile_id == profile_id), None)
+        if record is None or kind not in PROFILE_KINDS:
+            return None
+        return record.pstats_path if kind == "pstats" else record.folded_path
+
+    def _write(self, label: str, duration: float, profile: cProfile.Profile,
+               sampler: StackSampler) -> ProfileRecord:
+        """Write the pstats and collapsed-stack files and forget the oldest profile."""
+        os.makedirs(self.folder, exist_ok=True)
+        profile_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:8]
+        base = os.path.join(self.folder, profile_id)
+        profile.dump_stats(base + PROFILE_KINDS["pstats"])
+        with open(base + PROFILE_KINDS["folded"], "w", encoding="utf-8") as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        record = ProfileRecord(
+            profile_id=profile_id,
+            label=label,
+            created_at=time.time(),
+            duration=duration,
+            samples=sum(sampler.stacks.values()),
+            pstats_path=base + PROFILE_KINDS["pstats"],
+            folded_path=base + PROFILE_KINDS["folded"],
+        )
+        with self._lock:
+            self._records.append(record)
+            while len(self._records) > self.keep:
+                self._records.popleft()
+            self._prune()
+        return record
+
+    def _prune(self) -> None:
+        """Delete files beyond the newest profiles, including ones left by earlier processes."""
+        # Profile ids start with a timestamp, so names sort oldest first
+        ids = sorted(name[:-len(PROFILE_KINDS["pstats"])] for name in os.listdir(self.folder)
+                     if name.endswith(PROFILE_KINDS["pstats"]))
+        for profile_id in ids[:-self.keep]:
+            for extension in PROFILE_KINDS.values():
+                try:
+                    os.remove(os.path.join(self.folder, profile_id + extension))
+                except OSError:
+                    pass
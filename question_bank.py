@@ -0,0 +1,171 @@
+"""
+Question bank over many config files and config sets.
+Indexes every item by answer word and by source file, and draws review papers by weighted
+sampling across files with per-file quotas and no repeated words.
+"""
+import fnmatch
+import random
+import re
+import secrets
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config_registry import ConfigRegistry
+from exceptions import ValidationError
+from models import TestData, TestItem
+from services import SEED_BITS
+
+SECTIONS = ("explain", "statement")
+OPTIONAL_SUFFIX = re.compile(r"\([^)]*\)$")
+
+
+def word_key(word: str) -> str:
+    """Normalise an answer word so "Exist(ed)" and "exist" count as the same word."""
+    return OPTIONAL_SUFFIX.sub("", word).strip().lower()
+
+
+def source_name(config_set: str, filename: str) -> str:
+    """Name of a bank source file, e.g. "cfg-202602/AL-p01.json"."""
+    return f"{config_set}/{filename}"
+
+
+@dataclass(frozen=True, slots=True)
+class WordEntry:
+    """One occurrence of an answer word in the bank."""
+    source: str
+    section: str
+    item: TestItem
+
+
+class QuestionBank:
+    """Items of many config files, indexed by answer word and by source file."""
+
+    def __init__(self, version: int = 0):
+        # Version of the registry the bank was built from
+        self.version = version
+        self._items: Dict[str, List[TestItem]] = {section: [] for section in SECTIONS}
+        self._keys: Dict[str, List[str]] = {section: [] for section in SECTIONS}
+        self._sources: Dict[str, List[str]] = {section: [] for section in SECTIONS}
+        # source -> section -> item indexes
+        self._by_file: Dict[str, Dict[str, List[int]]] = {}
+        # word key -> (section, item index)
+        self._by_word: Dict[str, List[Tuple[str, int]]] = {}
+
+    @classmethod
+    def from_registry(cls, registry: ConfigRegistry,
+                      config_sets: Optional[Iterable[str]] = None) -> "QuestionBank":
+        """Build a bank from every valid config in the registry, or only the given sets."""
+        wanted = set(config_sets) if config_sets is not None else None
+        bank = cls(version=registry.version)
+        for config_set, filename, entry in registry.iter_entries():
+            if entry.test_data is not None and (wanted is None or config_set in wanted):
+                bank.add(source_name(config_set, filename), entry.test_data)
+        return bank
+
+    def add(self, source: str, test_data: TestData) -> None:
+        """Add the items of one config file."""
+        file_index = self._by_file.setdefault(source, {section: [] for section in SECTIONS})
+        for section, items in zip(SECTIONS, (test_data.explain_items, test_data.statement_items)):
+            for item in items:
+                index = len(self._items[section])
+                key = word_key(item.word)
+                self._items[section].append(item)
+                self._keys[section].append(key)
+                self._sources[section].append(source)
+                file_index[section].append(index)
+                self._by_word.setdefault(key, []).append((section, index))
+
+    def list_files(self) -> List[Dict[str, object]]:
+        """Describe each source file with its item counts."""
+        return [
+            {"source": source, "explain": len(index["explain"]), "statement": len(index["statement"])}
+            for source, index in sorted(self._by_file.items())
+        ]
+
+    def find_word(self, word: str) -> List[WordEntry]:
+        """Every item, in any file, whose answer is the given word."""
+        return [
+            WordEntry(source=self._sources[section][index], section=section,
+                      item=self._items[section][index])
+            for section, index in self._by_word.get(word_key(word), [])
+        ]
+
+    def match_files(self, patterns: Sequence[str]) -> List[str]:
+        """Source files matching any of the glob patterns, e.g. "cfg-202602/AL-p*.json"."""
+        return [
+            source for source in sorted(self._by_file)
+            if any(fnmatch.fnmatchcase(source, pattern) for pattern in patterns)
+        ]
+
+    def sample(self, explain_count: int, statement_count: int, files: Optional[Sequence[str]] = None,
+               weights: Optional[Dict[str, float]] = None, per_file_max: Optional[int] = None,
+               seed: Optional[int] = None) -> TestData:
+        """Draw a review paper: files are picked by weight, then items within them, never repeating a word."""
+        if explain_count < 0 or statement_count < 0:
+            raise ValidationError("Item counts must not be negative")
+        caller_seeded = seed is not None
+        if seed is None:
+            seed = secrets.randbits(SEED_BITS)
+        rng = random.Random(seed)
+        sources = list(files) if files is not None else sorted(self._by_file)
+        unknown = [source for source in sources if source not in self._by_file]
+        if unknown:
+            raise ValidationError(f"Unknown bank files: {', '.join(unknown)}")
+
+        file_weights = [self._file_weight(source, weights) for source in sources]
+        explain_items = self._sample_section("explain", explain_count, sources, file_weights,
+                                             per_file_max, rng)
+        statement_items = self._sample_section("statement", statement_count, sources, file_weights,
+                                               per_file_max, rng)
+        return TestData(explain_items=explain_items, statement_items=statement_items, seed=seed,
+                        caller_seeded=caller_seeded)
+
+    def _sample_section(self, section: str, count: int, sources: List[str], file_weights: List[float],
+                        per_file_max: Optional[int], rng: random.Random) -> List[TestItem]:
+        """Weighted draw of one section's items without repeating an answer word."""
+        eligible = [
+            (source, weight) for source, weight in zip(sources, file_weights)
+            if weight > 0 and self._by_file[source][section]
+        ]
+        remaining: Dict[str, List[int]] = {}
+        taken: Dict[str, int] = {}
+        used_words = set()
+        chosen: List[TestItem] = []
+        cumulative = list(accumulate(weight for _, weight in eligible))
+
+        while len(chosen) < count:
+            if not eligible:
+                raise ValidationError(
+                    f"Only {len(chosen)} {section} items with distinct words are available, {count} requested"
+                )
+            position = bisect_right(cumulative, rng.random() * cumulative[-1])
+            source = eligible[min(position, len(eligible) - 1)][0]
+
+            # Draw without replacement by swapping the picked index to the end of a per-file copy
+            pool = remaining.get(source)
+            if pool is None:
+                pool = remaining[source] = list(self._by_file[source][section])
+            pick = rng.randrange(len(pool))
+            pool[pick], pool[-1] = pool[-1], pool[pick]
+            index = pool.pop()
+
+            key = self._keys[section][index]
+            if key not in used_words:
+                used_words.add(key)
+                chosen.append(self._items[section][index])
+                taken[source] = taken.get(source, 0) + 1
+
+            if not pool or (per_file_max is not None and taken.get(source, 0) >= per_file_max):
+                eligible = [entry for entry in eligible if entry[0] != source]
+                cumulative = list(accumulate(weight for _, weight in eligible))
+        return chosen
+
+    @staticmethod
+    def _file_weight(source: str, weights: Optional[Dict[str, float]]) -> float:
+        """Weight of the first matching pattern, 1.0 when none matches."""
+        for pattern, weight in (weights or {}).items():
+            if fnmatch.fnmatchcase(source, pattern):
+                return weight
+        return 1.0
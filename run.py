@@ -3,9 +3,16 @@ Refactored main application entry point.
 Clean, maintainable code following SOLID principles.
 """
 import argparse
+import fnmatch
+import os
 import sys
-from application import TestPaperApplication
-from exceptions import TestPaperGeneratorError
+import time
+from typing import TYPE_CHECKING
+from exceptions import TestPaperGeneratorError, ValidationError
+
+# Modes import what they need on first use, so --help, --list and -i start fast
+if TYPE_CHECKING:
+    from application import TestPaperApplication
 
 
 def parse_arguments():
@@ -16,23 +23,126 @@ def parse_arguments():
     parser.add_argument(
         "-i", "--input", 
         type=str, 
-        help="Input JSON configuration file name (in cfg folder)"
+        nargs="+",
+        metavar="FILE",
+        help="Input JSON configuration file names or globs (e.g. 'AL-p*') in the config set"
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Generate papers for every configuration file in the config set"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        help="With several input files: number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--config-set",
+        type=str,
+        help="Config set folder to read the input file from (e.g. cfg-202509); defaults to CFG_VERSION"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1,
+        help="Number of shuffled variants to generate from the input file"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Shuffle seed; reuse the seed printed in a paper's header to regenerate it"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List the config sets and their configuration files; with --config-set, only that set"
     )
     parser.add_argument(
         "--gui", 
         action="store_true", 
         help="Launch GUI mode for interactive use"
     )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="Delete old and least recently downloaded files from the output folder"
+    )
+    parser.add_argument(
+        "--max-size-mb",
+        type=float,
+        help="With --gc: output folder size budget in MB"
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=float,
+        help="With --gc: delete files not used for this many days"
+    )
+    parser.add_argument(
+        "--max-files",
+        type=int,
+        help="With --gc: maximum number of files to keep"
+    )
+    parser.add_argument(
+        "--review",
+        nargs="+",
+        metavar="PATTERN",
+        help="Generate a review paper sampled from config files matching these patterns "
+             "(e.g. 'cfg-202602/AL-*.json')"
+    )
+    parser.add_argument(
+        "--explain",
+        type=int,
+        default=10,
+        help="With --review: number of explain items"
+    )
+    parser.add_argument(
+        "--statement",
+        type=int,
+        default=10,
+        help="With --review: number of statement items"
+    )
+    parser.add_argument(
+        "--per-file-max",
+        type=int,
+        help="With --review: maximum items per section taken from one config file"
+    )
+    parser.add_argument(
+        "--weight",
+        action="append",
+        default=[],
+        metavar="PATTERN=WEIGHT",
+        help="With --review: relative weight of matching config files (default 1); repeatable"
+    )
+    parser.add_argument(
+        "--name",
+        type=str,
+        default="review",
+        help="With --review: base filename of the review paper"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run and write pstats and collapsed-stack files to output/.profiles"
+    )
     return parser.parse_args()
 
 
-def run_command_line_mode(app: TestPaperApplication, input_filename: str):
+def run_command_line_mode(app: "TestPaperApplication", input_filename: str, count: int = 1,
+                          config_set: str = None, seed: int = None):
     """Run the application in command line mode."""
     try:
-        generated_files = app.generate_test_paper(input_filename)
+        if count > 1:
+            generated_batch = app.generate_batch(input_filename, count, seed=seed,
+                                                 config_set=config_set)
+        else:
+            generated_batch = [app.generate_test_paper(input_filename, config_set=config_set,
+                                                       seed=seed)]
         print("Files generated successfully:")
-        print(f"  Test paper: {generated_files.test_file_path}")
-        print(f"  Answer sheet: {generated_files.answer_file_path}")
+        for generated_files in generated_batch:
+            print(f"  Test paper: {generated_files.test_file_path}")
+            print(f"  Answer sheet: {generated_files.answer_file_path}")
+            print(f"  Seed: {generated_files.seed}")
         return True
     except TestPaperGeneratorError as e:
         print(f"Error: {e}")
@@ -42,7 +152,196 @@ def run_command_line_mode(app: TestPaperApplication, input_filename: str):
         return False
 
 
-def run_gui_mode(app: TestPaperApplication):
+def resolve_input_files(app: "TestPaperApplication", patterns: list, config_set: str = None,
+                        all_files: bool = False) -> list:
+    """Expand input names and globs (or every file with --all) into config filenames, without repeats."""
+    available = sorted(app.get_available_files(config_set))
+    if all_files:
+        return available
+    
+    filenames = []
+    for pattern in patterns:
+        if not any(char in pattern for char in "*?["):
+            # Plain names are passed through so a missing file is reported by the generator
+            matches = [pattern]
+        else:
+            matches = [name for name in available
+                       if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(os.path.splitext(name)[0], pattern)]
+        if not matches:
+            raise ValidationError(f"No config files match {pattern}")
+        filenames.extend(name for name in matches if name not in filenames)
+    return filenames
+
+
+_worker_app = None  # The application of a --jobs worker process, created by _init_worker
+
+
+def generate_file(app: "TestPaperApplication", input_filename: str, count: int = 1,
+                  config_set: str = None, seed: int = None) -> dict:
+    """Generate the papers of one config file and report how long it took or why it failed."""
+    start = time.perf_counter()
+    generated_batch, error = [], None
+    try:
+        if count > 1:
+            generated_batch = app.generate_batch(input_filename, count, seed=seed, config_set=config_set)
+        else:
+            generated_batch = [app.generate_test_paper(input_filename, config_set=config_set, seed=seed)]
+    except TestPaperGeneratorError as e:
+        error = str(e)
+    except Exception as e:
+        error = f"Unexpected error: {e}"
+    return {
+        "input": input_filename,
+        "seconds": time.perf_counter() - start,
+        "generated": generated_batch,
+        "error": error,
+    }
+
+
+def _init_worker() -> None:
+    """Create a --jobs worker's application and DOCX template up front, so file timings exclude startup."""
+    global _worker_app
+    from application import TestPaperApplication
+    from docx_template import get_docx_template
+    from models import TestPaperConfig
+    from services import DocumentGenerator, FileManager
+    file_manager = FileManager()
+    # Files already render in parallel, so a --count batch stays in its worker process
+    _worker_app = TestPaperApplication(file_manager=file_manager,
+                                       document_generator=DocumentGenerator(file_manager, max_workers=1))
+    config = TestPaperConfig(input_filename="")
+    get_docx_template(config.font_name, config.font_size, config.margin_inches)
+
+
+def _generate_file_in_worker(input_filename: str, count: int, config_set: str, seed: int) -> dict:
+    """generate_file for a worker process of the --jobs pool."""
+    return generate_file(_worker_app, input_filename, count, config_set, seed)
+
+
+def run_multi_file_mode(app: "TestPaperApplication", filenames: list, count: int = 1,
+                        config_set: str = None, seed: int = None, jobs: int = None):
+    """Generate papers for several config files across worker processes and summarise the run."""
+    jobs = max(1, min(len(filenames), jobs or os.cpu_count() or 1))
+    print(f"Generating {len(filenames)} config files" + (f" with {jobs} worker processes..." if jobs > 1 else "..."))
+    start = time.perf_counter()
+    results = {}
+    
+    def report(result: dict) -> None:
+        results[result["input"]] = result
+        status = "failed" if result["error"] else "ok"
+        print(f"[{len(results)}/{len(filenames)}] {result['input']} {status} ({result['seconds']:.2f}s)",
+              flush=True)
+    
+    if jobs == 1:
+        for filename in filenames:
+            report(generate_file(app, filename, count, config_set, seed))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+            futures = [executor.submit(_generate_file_in_worker, filename, count, config_set, seed)
+                       for filename in filenames]
+            for future in as_completed(futures):
+                report(future.result())
+    elapsed = time.perf_counter() - start
+    
+    width = max(len("File"), *(len(filename) for filename in filenames))
+    print()
+    print(f"{'File':<{width}}  {'Status':<7}{'Seconds':>9}{'Papers':>8}")
+    for filename in filenames:
+        result = results[filename]
+        status = "failed" if result["error"] else "ok"
+        print(f"{filename:<{width}}  {status:<7}{result['seconds']:>9.2f}{len(result['generated']):>8}")
+    
+    failures = [results[filename] for filename in filenames if results[filename]["error"]]
+    papers = sum(len(result["generated"]) for result in results.values())
+    print(f"Generated {papers} papers from {len(filenames) - len(failures)} of {len(filenames)} config files "
+          f"in {elapsed:.2f}s (sum of per-file times {sum(r['seconds'] for r in results.values()):.2f}s)")
+    if failures:
+        print(f"{len(failures)} config files failed:")
+        for result in failures:
+            print(f"  {result['input']}: {result['error']}")
+    return not failures
+
+
+def run_list_mode(app: "TestPaperApplication", config_set: str = None):
+    """Print the available config sets and the configuration files in each."""
+    config_sets = [config_set] if config_set else app.get_config_sets()
+    try:
+        for name in config_sets:
+            files = sorted(app.get_available_files(name))
+            print(f"{name} ({len(files)} files):")
+            for filename in files:
+                print(f"  {filename}")
+        return True
+    except TestPaperGeneratorError as e:
+        print(f"Error: {e}")
+        return False
+
+
+def run_gc_mode(max_size_mb: float = None, max_age_days: float = None, max_files: int = None):
+    """Apply the retention policy to the output folder once.
+
+    Unlike the server's janitor this process cannot see a running server's jobs or warm pool,
+    so next to a live server only the policy's minimum file age protects files still in use.
+    """
+    import sqlite3
+    from generation_catalog import GenerationCatalog
+    from output_janitor import OutputJanitor, RetentionPolicy
+    
+    defaults = RetentionPolicy()
+    policy = RetentionPolicy(
+        max_bytes=int(max_size_mb * 1024 * 1024) if max_size_mb is not None else defaults.max_bytes,
+        max_age_seconds=max_age_days * 24 * 3600 if max_age_days is not None else defaults.max_age_seconds,
+        max_files=max_files if max_files is not None else defaults.max_files,
+    )
+    try:
+        # Keep the catalog in step, so history no longer lists the deleted files as downloadable
+        catalog = GenerationCatalog()
+        result = OutputJanitor(policy=policy, on_removed=catalog.mark_removed).collect()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return False
+    print(f"Removed {result['removed_files']} files, "
+          f"reclaimed {result['reclaimed_bytes'] / (1024 * 1024):.1f} MB")
+    print(f"Output folder: {result['files']} files, {result['bytes'] / (1024 * 1024):.1f} MB")
+    return True
+
+
+def run_review_mode(app: "TestPaperApplication", patterns: list, explain_count: int, statement_count: int,
+                    per_file_max: int = None, weight_args: list = (), seed: int = None,
+                    name: str = "review"):
+    """Generate a review paper sampled across every config file matching the patterns."""
+    weights = {}
+    for arg in weight_args:
+        pattern, _, weight = arg.rpartition("=")
+        try:
+            weights[pattern] = float(weight)
+        except ValueError:
+            print(f"Error: Invalid --weight {arg!r}, expected PATTERN=WEIGHT")
+            return False
+    from config_registry import ConfigRegistry
+    from question_bank import QuestionBank
+    
+    try:
+        bank = QuestionBank.from_registry(ConfigRegistry())
+        files = bank.match_files(patterns)
+        if not files:
+            print(f"Error: No config files match {' '.join(patterns)}")
+            return False
+        generated_files = app.generate_review(bank, explain_count, statement_count, files=files,
+                                              weights=weights, per_file_max=per_file_max,
+                                              seed=seed, name=name)
+        print(f"Review paper generated from {len(files)} config files:")
+        print(f"  Test paper: {generated_files.test_file_path}")
+        print(f"  Answer sheet: {generated_files.answer_file_path}")
+        print(f"  Seed: {generated_files.seed}")
+        return True
+    except TestPaperGeneratorError as e:
+        print(f"Error: {e}")
+        return False
+
+
+def run_gui_mode(app: "TestPaperApplication"):
     """Run the application in GUI mode."""
     try:
         app.run_gui_mode()
@@ -55,22 +354,60 @@ def run_gui_mode(app: TestPaperApplication):
         return False
 
 
+def run_selected_mode(app: "TestPaperApplication", args) -> bool:
+    """Run the mode chosen on the command line."""
+    if args.gc:
+        success = run_gc_mode(args.max_size_mb, args.max_age_days, args.max_files)
+    elif args.review:
+        success = run_review_mode(app, args.review, args.explain, args.statement, args.per_file_max,
+                                  args.weight, args.seed, args.name)
+    elif args.list:
+        success = run_list_mode(app, args.config_set)
+    elif args.gui:
+        success = run_gui_mode(app)
+    elif args.input or args.all:
+        try:
+            filenames = resolve_input_files(app, args.input or [], args.config_set, args.all)
+        except TestPaperGeneratorError as e:
+            print(f"Error: {e}")
+            return False
+        if len(filenames) == 1 and not args.all:
+            success = run_command_line_mode(app, filenames[0], args.count, args.config_set, args.seed)
+        else:
+            success = run_multi_file_mode(app, filenames, args.count, args.config_set, args.seed, args.jobs)
+    else:
+        print("Error: Please provide an input file with -i or use --gui for GUI mode")
+        print("Use -h for help")
+        success = False
+    return success
+
+
+def run_profiled(app: "TestPaperApplication", args) -> bool:
+    """Run the chosen mode under the profiler and summarise where the time went."""
+    import pstats
+    from profiler import Profiler
+    
+    success, record = Profiler(sample_every=0).run(" ".join(sys.argv[1:]), run_selected_mode, app, args)
+    print(f"Profile ({record.duration:.3f}s, {record.samples} stack samples):")
+    print(f"  pstats: {record.pstats_path}")
+    print(f"  Collapsed stacks: {record.folded_path}")
+    pstats.Stats(record.pstats_path).sort_stats("cumulative").print_stats(15)
+    return success
+
+
 def main():
     """Main application entry point."""
     args = parse_arguments()
     
     # Create application instance
+    from application import TestPaperApplication
     app = TestPaperApplication()
     
     # Determine mode and run
-    if args.gui:
-        success = run_gui_mode(app)
-    elif args.input:
-        success = run_command_line_mode(app, args.input)
+    if args.profile:
+        success = run_profiled(app, args)
     else:
-        print("Error: Please provide an input file with -i or use --gui for GUI mode")
-        print("Use -h for help")
-        success = False
+        success = run_selected_mode(app, args)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
@@ -2,74 +2,173 @@
 Service classes implementing the core business logic.
 Each class has a single responsibility following SOLID principles.
 """
+import io
 import json
 import os
 import random
-import datetime
-from typing import List
-from docx import Document
-from docx.shared import Inches, Pt
+import re
+import secrets
+import sys
+import threading
+from itertools import repeat
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+from metrics import BYTES_WRITTEN, stage_timer
 from interfaces import (
     ConfigLoaderInterface, DocumentGeneratorInterface, 
     FileManagerInterface, DataShufflerInterface
 )
-from models import TestData, TestItem, TestPaperConfig, GeneratedFiles
+from models import TestData, TestItem, TestPaperConfig, GeneratedFiles, RenderedPaper, ShuffledItems
 from exceptions import ConfigurationError, ValidationError, DocumentGenerationError
-from variables import CFG_FOLDER, OUTPUT_FOLDER
+from variables import CFG_FOLDER, CFG_SET_PREFIX, OUTPUT_FOLDER
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+if TYPE_CHECKING:
+    from docx.document import Document
+    from config_registry import ConfigRegistry
+
+OUTPUT_EXTENSIONS = (".docx", ".pdf")  # Generated files sharing one name stem
+COUNTER_FOLDER_NAME = ".counters"  # Persisted next-counter per output name, inside the output folder
+STATEMENT_BLANK = "__________________"
+SEED_BITS = 32  # Size of generated shuffle seeds; small enough to read off a printed header
+
+
+def build_paper_lines(test_data: TestData, config: TestPaperConfig) -> List[Tuple[str, str, str]]:
+    """Build the (kind, test line, answer line) rows shared by every document renderer."""
+    lines = []
+    heading_count = 0
+    
+    # Generate explain section
+    if test_data.explain_items:
+        lines.append(("heading", config.headings[heading_count], config.headings[heading_count]))
+        heading_count += 1
+        
+        for i, item in enumerate(test_data.explain_items, 1):
+            lines.append(("item", f"{i} ________________: {item.text}", f"{i} {item.word} : {item.text}"))
+    
+    # Generate statement section
+    if test_data.statement_items:
+        lines.append(("heading", config.headings[heading_count], config.headings[heading_count]))
+        
+        for i, item in enumerate(test_data.statement_items, 1):
+            test_text = item.blanked(STATEMENT_BLANK)
+            lines.append(("item", f"{i} {test_text}", f"{i} {item.word} : {item.text}"))
+    
+    return lines
+
+
+def parse_config_file(file_path: str) -> TestData:
+    """Read, parse and validate one JSON configuration file."""
+    if not os.path.exists(file_path):
+        raise ConfigurationError(f"Configuration file not found: {file_path}")
+    
+    try:
+        with open(file_path, "r", encoding="utf8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        raise ConfigurationError(f"Error reading configuration file: {e}")
+    
+    return parse_config_data(data)
+
+
+def parse_config_data(data: dict) -> TestData:
+    """Build and validate TestData from a decoded configuration, interning its strings."""
+    # Parse explain items
+    explain_items = []
+    for item in data.get("explain", []):
+        if isinstance(item, (list, tuple)) and len(item) == 2:
+            explain_items.append(TestItem(text=sys.intern(item[0]), word=sys.intern(item[1])))
+        else:
+            raise ConfigurationError(f"Invalid explain item format: {item}")
+    
+    # Parse statement items
+    statement_items = []
+    for item in data.get("statement", []):
+        if isinstance(item, (list, tuple)) and len(item) == 2:
+            statement_items.append(TestItem.statement(text=sys.intern(item[0]), word=sys.intern(item[1])))
+        else:
+            raise ConfigurationError(f"Invalid statement item format: {item}")
+    
+    test_data = TestData(explain_items=explain_items, statement_items=statement_items)
+    
+    if not test_data.validate():
+        raise ValidationError("Test data validation failed")
+    
+    return test_data
+
+
+def build_header_text(filename: str, seed: Optional[int] = None) -> str:
+    """Build the page header: the filename, plus the shuffle seed needed to regenerate the paper."""
+    if seed is None:
+        return filename
+    return f"{filename}  (seed {seed})"
+
+
+def build_memory_filenames(base_filename: str, seed: Optional[int], extension: str) -> Tuple[str, str]:
+    """Name in-memory papers by seed instead of reserving an output counter."""
+    stem = f"{base_filename}_test" if seed is None else f"{base_filename}_test_{seed}"
+    return f"{stem}{extension}", f"{stem}-ans{extension}"
 
 
 class ConfigLoader(ConfigLoaderInterface):
     """Handles loading and parsing of test configuration files."""
     
-    def __init__(self, config_folder: str = CFG_FOLDER):
+    def __init__(self, config_folder: str = CFG_FOLDER, registry: Optional["ConfigRegistry"] = None):
         self.config_folder = config_folder
+        # When a registry is given, configs are served from its in-memory cache
+        self.registry = registry
+        # The folder's own config set is the default; sibling cfg-* folders are the others
+        self.config_set = os.path.basename(os.path.normpath(config_folder))
+        self.base_dir = os.path.dirname(os.path.normpath(config_folder))
     
-    def load_config(self, filename: str) -> TestData:
+    def load_config(self, filename: str, config_set: Optional[str] = None) -> TestData:
         """Load test data from JSON configuration file."""
         if not filename.endswith(".json"):
             filename += ".json"
         
-        file_path = os.path.join(self.config_folder, filename)
+        config_set = config_set or self.config_set
+        if self.registry is not None:
+            return self.registry.get_config(config_set, filename)
         
-        if not os.path.exists(file_path):
-            raise ConfigurationError(f"Configuration file not found: {file_path}")
-        
-        try:
-            with open(file_path, "r", encoding="utf8") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            raise ConfigurationError(f"Error reading configuration file: {e}")
-        
-        # Parse explain items
-        explain_items = []
-        for item in data.get("explain", []):
-            if isinstance(item, (list, tuple)) and len(item) == 2:
-                explain_items.append(TestItem(text=item[0], word=item[1]))
-            else:
-                raise ConfigurationError(f"Invalid explain item format: {item}")
-        
-        # Parse statement items
-        statement_items = []
-        for item in data.get("statement", []):
-            if isinstance(item, (list, tuple)) and len(item) == 2:
-                statement_items.append(TestItem(text=item[0], word=item[1]))
-            else:
-                raise ConfigurationError(f"Invalid statement item format: {item}")
-        
-        test_data = TestData(explain_items=explain_items, statement_items=statement_items)
+        return parse_config_file(os.path.join(self._get_set_folder(config_set), filename))
+    
+    def get_available_files(self, config_set: Optional[str] = None) -> List[str]:
+        """Get list of available JSON configuration files."""
+        config_set = config_set or self.config_set
+        if self.registry is not None:
+            return self.registry.list_files(config_set)
         
-        if not test_data.validate():
-            raise ValidationError("Test data validation failed")
+        config_folder = self._get_set_folder(config_set)
+        if not os.path.exists(config_folder):
+            return []
         
-        return test_data
+        return [f for f in os.listdir(config_folder) if f.endswith(".json")]
     
-    def get_available_files(self) -> List[str]:
-        """Get list of available JSON configuration files."""
-        if not os.path.exists(self.config_folder):
+    def get_config_sets(self) -> List[str]:
+        """Get list of config set folders next to the default one."""
+        if self.registry is not None:
+            return self.registry.list_config_sets()
+        
+        if not os.path.isdir(self.base_dir):
             return []
         
-        return [f for f in os.listdir(self.config_folder) if f.endswith(".json")]
+        return sorted(
+            name for name in os.listdir(self.base_dir)
+            if name.startswith(CFG_SET_PREFIX) and os.path.isdir(os.path.join(self.base_dir, name))
+        )
+    
+    def _get_set_folder(self, config_set: str) -> str:
+        """Resolve a config set name to its folder, rejecting anything but a sibling cfg-* folder."""
+        if config_set == self.config_set:
+            return self.config_folder
+        if os.path.basename(config_set) != config_set or not config_set.startswith(CFG_SET_PREFIX):
+            raise ConfigurationError(f"Invalid config set: {config_set}")
+        return os.path.join(self.base_dir, config_set)
 
 
 class FileManager(FileManagerInterface):
@@ -77,141 +176,286 @@ class FileManager(FileManagerInterface):
     
     def __init__(self, output_folder: str = OUTPUT_FOLDER):
         self.output_folder = output_folder
-        self.ensure_output_directory()
+        self.counter_folder = os.path.join(output_folder, COUNTER_FOLDER_NAME)
+        # The output folder is created by the first reservation, so building a manager writes nothing
+        self._counter_lock = threading.Lock()
+    
+    def __getstate__(self) -> dict:
+        """Drop the thread lock, so process pool workers can receive the manager."""
+        state = self.__dict__.copy()
+        del state["_counter_lock"]
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled manager with a lock of its own."""
+        self.__dict__.update(state)
+        self._counter_lock = threading.Lock()
     
     def ensure_output_directory(self) -> None:
         """Ensure output directory exists."""
-        os.makedirs(self.output_folder, exist_ok=True)
+        os.makedirs(self.counter_folder, exist_ok=True)
     
     def get_unique_filename(self, base_filename: str, extension: str = ".docx") -> str:
-        """Generate a unique filename to avoid conflicts."""
-        counter = 0
+        """Reserve a unique filename to avoid conflicts."""
+        pattern = re.compile(rf"{re.escape(base_filename)}(?:-(\d+))?{re.escape(extension)}")
         while True:
+            counter = self._reserve_counters(base_filename + extension, 1, pattern)[0]
             if counter == 0:
                 filename = f"{base_filename}{extension}"
             else:
                 filename = f"{base_filename}-{counter}{extension}"
             
-            filepath = os.path.join(self.output_folder, filename)
-            if not os.path.exists(filepath):
+            if not os.path.exists(os.path.join(self.output_folder, filename)):
                 return filename
-            counter += 1
+    
+    def reserve_test_filenames(self, base_filename: str, count: int = 1,
+                               extension: str = ".docx") -> List[Tuple[str, str]]:
+        """Reserve test and answer filenames for several papers in one atomic step."""
+        pattern = re.compile(rf"{re.escape(base_filename)}_test(?:-(\d+))?(?:-ans[^.]*)?\.\w+")
+        names = []
+        while len(names) < count:
+            for counter in self._reserve_counters(base_filename + "_test", count - len(names), pattern):
+                if counter == 0:
+                    test_filename = f"{base_filename}_test{extension}"
+                else:
+                    test_filename = f"{base_filename}_test-{counter}{extension}"
+                ans_filename = f"{base_filename}_test-{counter}-ans{extension}"
+                
+                # Skip names created outside the allocator, e.g. copied in by hand
+                if self._is_name_taken(test_filename) or self._is_name_taken(ans_filename):
+                    continue
+                names.append((test_filename, ans_filename))
+        return names
+    
+    def _reserve_counters(self, name: str, count: int, pattern: "re.Pattern") -> range:
+        """Take the next counters for a name, atomically across threads and processes."""
+        counter_path = os.path.join(self.counter_folder, name)
+        with self._counter_lock:
+            try:
+                fd = os.open(counter_path, os.O_RDWR | os.O_CREAT, 0o644)
+            except FileNotFoundError:
+                self.ensure_output_directory()
+                fd = os.open(counter_path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "r+", encoding="utf-8") as f:
+                lock_file(f)
+                try:
+                    content = f.read().strip()
+                    # First use of this name: continue after files from before the counter existed
+                    start = int(content) if content.isdigit() else self._scan_next_counter(pattern)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(str(start + count))
+                    f.flush()
+                finally:
+                    unlock_file(f)
+        return range(start, start + count)
+    
+    def _scan_next_counter(self, pattern: "re.Pattern") -> int:
+        """Find the counter after the highest one already used in the output folder."""
+        next_counter = 0
+        for filename in os.listdir(self.output_folder):
+            match = pattern.fullmatch(filename)
+            if match:
+                next_counter = max(next_counter, int(match.group(1) or 0) + 1)
+        return next_counter
+    
+    def _is_name_taken(self, filename: str) -> bool:
+        """Check whether the name is used in any output format (a DOCX converts to a same-named PDF)."""
+        stem = os.path.splitext(filename)[0]
+        return any(
+            os.path.exists(os.path.join(self.output_folder, stem + extension))
+            for extension in OUTPUT_EXTENSIONS
+        )
+
+
+def lock_file(f) -> None:
+    """Take an exclusive lock on an open file, waiting for other processes."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        f.seek(0)
+
+
+def unlock_file(f) -> None:
+    """Release a lock taken with lock_file."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
 
 
 class DataShuffler(DataShufflerInterface):
     """Handles randomization of test data."""
     
-    def shuffle_data(self, test_data: TestData) -> TestData:
-        """Shuffle test data items randomly using current timestamp as seed."""
-        random.seed(datetime.datetime.now().timestamp())
-        
-        # Create copies to avoid modifying original data
-        shuffled_explain = test_data.explain_items.copy()
-        shuffled_statement = test_data.statement_items.copy()
-        
-        random.shuffle(shuffled_explain)
-        random.shuffle(shuffled_statement)
+    def shuffle_data(self, test_data: TestData, seed: Optional[int] = None) -> TestData:
+        """Shuffle test data items with a per-call RNG, drawing a fresh seed unless one is given."""
+        caller_seeded = seed is not None
+        if seed is None:
+            seed = secrets.randbits(SEED_BITS)
+        rng = random.Random(seed)
         
+        # Permute index arrays over the shared items instead of copying the item lists
         return TestData(
-            explain_items=shuffled_explain,
-            statement_items=shuffled_statement
+            explain_items=ShuffledItems.permute(test_data.explain_items, rng),
+            statement_items=ShuffledItems.permute(test_data.statement_items, rng),
+            seed=seed,
+            caller_seeded=caller_seeded
         )
 
 
 class DocumentGenerator(DocumentGeneratorInterface):
     """Generates Word documents for test papers and answer sheets."""
     
-    def __init__(self, file_manager: FileManagerInterface):
+    def __init__(self, file_manager: FileManagerInterface, max_workers: Optional[int] = None,
+                 use_template: bool = True):
         self.file_manager = file_manager
+        self.max_workers = max_workers
+        # The preparsed template engine is the fast path; python-docx building is kept for comparison
+        self.use_template = use_template
     
     def generate_test_paper(self, test_data: TestData, config: TestPaperConfig) -> GeneratedFiles:
         """Generate test paper and answer sheet documents."""
+        try:
+            base_filename = config.input_filename.split(".")[0]
+            test_filename, ans_filename = self.file_manager.reserve_test_filenames(base_filename)[0]
+            return self._render_test_paper(test_data, config, test_filename, ans_filename)
+        except Exception as e:
+            raise DocumentGenerationError(f"Failed to generate documents: {e}")
+    
+    def generate_test_papers(self, variants: List[TestData], config: TestPaperConfig) -> List[GeneratedFiles]:
+        """Generate one test paper per variant, rendering across a process pool."""
         try:
             base_filename = config.input_filename.split(".")[0]
             
-            # Generate unique filenames  
-            test_counter = 0
-            ans_counter = 0
-            
-            # Find unique test filename
-            while True:
-                if test_counter == 0:
-                    test_filename = f"{base_filename}_test.docx"
-                else:
-                    test_filename = f"{base_filename}_test-{test_counter}.docx"
-                
-                test_filepath = os.path.join(self.file_manager.output_folder, test_filename)
-                if not os.path.exists(test_filepath):
-                    break
-                test_counter += 1
-            
-            # Find unique answer filename
-            while True:
-                if ans_counter == 0:
-                    ans_filename = f"{base_filename}_test-{test_counter}-ans.docx"
-                else:
-                    ans_filename = f"{base_filename}_test-{test_counter}-ans-{ans_counter}.docx"
-                
-                ans_filepath = os.path.join(self.file_manager.output_folder, ans_filename)
-                if not os.path.exists(ans_filepath):
-                    break
-                ans_counter += 1
+            # Reserve every filename up front so workers never touch the allocator
+            names = self.file_manager.reserve_test_filenames(base_filename, count=len(variants))
+            test_filenames = [test_filename for test_filename, _ in names]
+            ans_filenames = [ans_filename for _, ans_filename in names]
             
-            # Create documents
-            test_doc = Document()
-            ans_doc = Document()
+            max_workers = min(len(variants), self.max_workers or os.cpu_count() or 1)
+            if max_workers <= 1:
+                return list(map(self._render_test_paper, variants, repeat(config),
+                                test_filenames, ans_filenames))
             
-            # Generate content
+            # Imported here: the process pool machinery is only needed for multi-core batches
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                generated = list(executor.map(self._render_test_paper, variants, repeat(config),
+                                              test_filenames, ans_filenames))
+            # Workers record metrics in their own process, so count the bytes they wrote here
+            BYTES_WRITTEN.inc(sum(os.path.getsize(path) for files in generated
+                                  for path in (files.test_file_path, files.answer_file_path)),
+                              format="docx")
+            return generated
+        
+        except Exception as e:
+            raise DocumentGenerationError(f"Failed to generate documents: {e}")
+    
+    def render_test_paper(self, test_data: TestData, config: TestPaperConfig) -> RenderedPaper:
+        """Render test paper and answer sheet documents into memory."""
+        try:
+            base_filename = config.input_filename.split(".")[0]
+            test_filename, ans_filename = build_memory_filenames(base_filename, test_data.seed, ".docx")
+            test_content, ans_content = self._render_documents(test_data, config, test_filename, ans_filename)
+            return RenderedPaper(
+                test_filename=test_filename,
+                test_content=test_content,
+                answer_filename=ans_filename,
+                answer_content=ans_content,
+                base_filename=base_filename,
+                seed=test_data.seed
+            )
+        except Exception as e:
+            raise DocumentGenerationError(f"Failed to render documents: {e}")
+    
+    def _render_test_paper(self, test_data: TestData, config: TestPaperConfig,
+                           test_filename: str, ans_filename: str) -> GeneratedFiles:
+        """Render and save both documents under the given filenames."""
+        base_filename = config.input_filename.split(".")[0]
+        test_filepath = os.path.join(self.file_manager.output_folder, test_filename)
+        ans_filepath = os.path.join(self.file_manager.output_folder, ans_filename)
+        
+        test_content, ans_content = self._render_documents(test_data, config, test_filename, ans_filename)
+        with stage_timer("write"):
+            with open(test_filepath, "wb") as f:
+                f.write(test_content)
+            with open(ans_filepath, "wb") as f:
+                f.write(ans_content)
+        BYTES_WRITTEN.inc(len(test_content) + len(ans_content), format="docx")
+        
+        return GeneratedFiles(
+            test_file_path=test_filepath,
+            answer_file_path=ans_filepath,
+            base_filename=base_filename,
+            seed=test_data.seed
+        )
+    
+    def _render_documents(self, test_data: TestData, config: TestPaperConfig,
+                          test_filename: str, ans_filename: str) -> Tuple[bytes, bytes]:
+        """Render both documents to DOCX bytes, with the filenames shown in their headers."""
+        if not self.use_template:
+            return self._build_with_python_docx(test_data, config, test_filename, ans_filename)
+        
+        # python-docx is slow to import, so only the modes that render DOCX pay for it
+        from docx_template import get_docx_template
+        template = get_docx_template(config.font_name, config.font_size, config.margin_inches)
+        with stage_timer("content"):
+            lines = build_paper_lines(test_data, config)
+        with stage_timer("render_docx"):
+            test_content = template.render([(kind, test) for kind, test, _ in lines],
+                                           build_header_text(test_filename, test_data.seed))
+            ans_content = template.render([(kind, ans) for kind, _, ans in lines],
+                                          build_header_text(ans_filename, test_data.seed))
+        return test_content, ans_content
+    
+    def _build_with_python_docx(self, test_data: TestData, config: TestPaperConfig,
+                                test_filename: str, ans_filename: str) -> Tuple[bytes, bytes]:
+        """Build both documents paragraph by paragraph with python-docx."""
+        from docx import Document
+        
+        # Create documents
+        test_doc = Document()
+        ans_doc = Document()
+        
+        # Generate content
+        with stage_timer("content"):
             self._generate_document_content(test_doc, ans_doc, test_data, config)
-            
-            # Apply formatting
+        
+        # Apply formatting
+        with stage_timer("formatting"):
             self._apply_document_formatting(test_doc, config)
             self._apply_document_formatting(ans_doc, config)
             
             # Set headers
-            self._set_document_header(test_doc, test_filename)
-            self._set_document_header(ans_doc, ans_filename)
-            
-            # Save documents
-            test_doc.save(test_filepath)
-            ans_doc.save(ans_filepath)
-            
-            return GeneratedFiles(
-                test_file_path=test_filepath,
-                answer_file_path=ans_filepath,
-                base_filename=base_filename
-            )
-            
-        except Exception as e:
-            raise DocumentGenerationError(f"Failed to generate documents: {e}")
+            self._set_document_header(test_doc, build_header_text(test_filename, test_data.seed))
+            self._set_document_header(ans_doc, build_header_text(ans_filename, test_data.seed))
+        
+        # Save documents
+        test_buffer = io.BytesIO()
+        ans_buffer = io.BytesIO()
+        with stage_timer("save"):
+            test_doc.save(test_buffer)
+            ans_doc.save(ans_buffer)
+        return test_buffer.getvalue(), ans_buffer.getvalue()
     
-    def _generate_document_content(self, test_doc: Document, ans_doc: Document, 
+    def _generate_document_content(self, test_doc: "Document", ans_doc: "Document", 
                                  test_data: TestData, config: TestPaperConfig) -> None:
         """Generate content for both test and answer documents."""
-        heading_count = 0
-        
-        # Generate explain section
-        if test_data.explain_items:
-            test_doc.add_heading(config.headings[heading_count], 1)
-            ans_doc.add_heading(config.headings[heading_count], 1)
-            heading_count += 1
-            
-            for i, item in enumerate(test_data.explain_items, 1):
-                test_doc.add_paragraph(f"{i} ________________: {item.text}")
-                ans_doc.add_paragraph(f"{i} {item.word} : {item.text}")
-        
-        # Generate statement section
-        if test_data.statement_items:
-            test_doc.add_heading(config.headings[heading_count], 1)
-            ans_doc.add_heading(config.headings[heading_count], 1)
-            
-            for i, item in enumerate(test_data.statement_items, 1):
-                test_text = item.text.replace(item.word, "__________________")
-                test_doc.add_paragraph(f"{i} {test_text}")
-                ans_doc.add_paragraph(f"{i} {item.word} : {item.text}")
+        for kind, test_line, ans_line in build_paper_lines(test_data, config):
+            if kind == "heading":
+                test_doc.add_heading(test_line, 1)
+                ans_doc.add_heading(ans_line, 1)
+            else:
+                test_doc.add_paragraph(test_line)
+                ans_doc.add_paragraph(ans_line)
     
-    def _apply_document_formatting(self, doc: Document, config: TestPaperConfig) -> None:
+    def _apply_document_formatting(self, doc: "Document", config: TestPaperConfig) -> None:
         """Apply formatting to document."""
+        from docx.shared import Inches, Pt
+        
         # Set font for all paragraphs
         for paragraph in doc.paragraphs:
             for run in paragraph.runs:
@@ -225,7 +469,7 @@ class DocumentGenerator(DocumentGeneratorInterface):
             section.left_margin = Inches(config.margin_inches)
             section.right_margin = Inches(config.margin_inches)
     
-    def _set_document_header(self, doc: Document, filename: str) -> None:
-        """Set document header with filename."""
+    def _set_document_header(self, doc: "Document", header_text: str) -> None:
+        """Set document header with filename and seed."""
         header = doc.sections[0].header
-        header.paragraphs[0].text = filename
\ No newline at end of file
+        header.paragraphs[0].text = header_text
\ No newline at end of file
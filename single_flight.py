@@ -0,0 +1,161 @@
+"""
+Single-flight coalescing of identical concurrent work.
+Callers with the same key share one computation: within a process they wait on the running
+call, and across processes (e.g. uvicorn workers) one worker claims the key in a shared lock
+file and computes while the others poll for the result it publishes.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from services import lock_file, unlock_file
+
+T = TypeVar("T")
+
+LOCK_STRIPES = 256  # Lock files shared by all keys, so the lock folder never grows
+CLAIM_TIMEOUT = 120.0  # Seconds before a claim whose worker never published is taken over
+POLL_INTERVAL = 0.05  # Seconds between checks while another worker holds the claim
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one computation."""
+
+    def __init__(self, lock_folder: Optional[str] = None, stripes: int = LOCK_STRIPES,
+                 claim_timeout: float = CLAIM_TIMEOUT, poll_interval: float = POLL_INTERVAL):
+        # None limits coalescing to this process
+        self.lock_folder = lock_folder
+        self.stripes = stripes
+        self.claim_timeout = claim_timeout
+        self.poll_interval = poll_interval
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"computed": 0, "coalesced": 0, "shared_across_processes": 0}
+
+    def do(self, key: str, fn: Callable[[], T], encode: Optional[Callable[[T], Any]] = None,
+           decode: Optional[Callable[[Any], Optional[T]]] = None) -> T:
+        """Run fn once for all concurrent callers of key and return its result to each.
+
+        encode and decode turn the result into JSON and back so other processes can reuse it;
+        decode returns None when a published result is no longer usable (e.g. its files are gone).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            return call.result()
+
+        try:
+            result = self._run_exclusive(key, fn, encode, decode)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Report computations run and requests served by another caller's computation."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["deduplicated"] = stats["coalesced"] + stats["shared_across_processes"]
+        return stats
+
+    def _run_exclusive(self, key: str, fn: Callable[[], T], encode: Optional[Callable[[T], Any]],
+                       decode: Optional[Callable[[Any], Optional[T]]]) -> T:
+        """Claim the key across processes and compute it, or wait for the worker holding the claim.
+
+        Claims and published results live in one of a fixed set of striped lock files. The file lock
+        is held only to read and update that file, never during the computation, so unrelated keys
+        on the same stripe do not wait for each other. A claim older than claim_timeout is treated
+        as abandoned and taken over.
+        """
+        if self.lock_folder is None:
+            return self._compute(fn)
+
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        lock_path = os.path.join(self.lock_folder, f"{int(digest[:8], 16) % self.stripes:03d}.lock")
+        os.makedirs(self.lock_folder, exist_ok=True)
+        waiting_since = time.time()
+        reuse = decode is not None
+        while True:
+            entry = self._update_stripe(lock_path, lambda entries: self._claim(entries, digest, waiting_since, reuse))
+            if entry is None:
+                break
+            if entry["state"] == "published":
+                # Another worker computed the same key while this one waited
+                result = decode(entry["result"])
+                if result is not None:
+                    with self._lock:
+                        self._stats["shared_across_processes"] += 1
+                    return result
+                reuse = False
+                continue
+            time.sleep(self.poll_interval)
+
+        try:
+            result = self._compute(fn)
+        except BaseException:
+            self._update_stripe(lock_path, lambda entries: entries.pop(digest, None))
+            raise
+        published = {"state": "published", "at": time.time()}
+        if encode is not None:
+            published["result"] = encode(result)
+        self._update_stripe(lock_path, lambda entries: entries.update({digest: published}))
+        return result
+
+    def _claim(self, entries: Dict[str, Dict[str, Any]], digest: str, waiting_since: float,
+               reuse: bool) -> Optional[Dict[str, Any]]:
+        """Return the entry to wait on or reuse, or claim the key and return None."""
+        entry = entries.get(digest)
+        now = time.time()
+        if entry is not None:
+            if reuse and entry["state"] == "published" and "result" in entry and entry["at"] >= waiting_since:
+                return entry
+            if entry["state"] == "running" and entry["at"] > now - self.claim_timeout:
+                return entry
+        entries[digest] = {"state": "running", "at": now}
+        return None
+
+    def _update_stripe(self, lock_path: str, update: Callable[[Dict[str, Dict[str, Any]]], Any]) -> Any:
+        """Apply update to a stripe's entries while holding its file lock, and write back any change."""
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+", encoding="utf-8") as f:
+            lock_file(f)
+            try:
+                try:
+                    loaded = json.loads(f.read() or "{}")
+                except ValueError:
+                    loaded = {}
+                entries = {digest: entry for digest, entry in loaded.items() if isinstance(entry, dict)}
+                before = dict(entries)
+                outcome = update(entries)
+                if entries != before:
+                    # Entries older than a claim can live are of no use to any waiter
+                    cutoff = time.time() - self.claim_timeout
+                    entries = {digest: entry for digest, entry in entries.items() if entry["at"] >= cutoff}
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(entries, f)
+                    f.flush()
+                return outcome
+            finally:
+                unlock_file(f)
+
+    def _compute(self, fn: Callable[[], T]) -> T:
+        """Run the computation and count it."""
+        result = fn()
+        with self._lock:
+            self._stats["computed"] += 1
+        return result
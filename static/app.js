@@ -1,5 +1,14 @@
-async function fetchConfigs() {
-  const res = await fetch('/api/configs');
+async function fetchConfigSets() {
+  const res = await fetch('/api/config_sets');
+  if (!res.ok) {
+    console.error('Failed to fetch config sets');
+    return [];
+  }
+  return await res.json();
+}
+
+async function fetchConfigs(configSet) {
+  const res = await fetch(`/api/configs?config_set=${encodeURIComponent(configSet)}`);
   if (!res.ok) {
     console.error('Failed to fetch configs');
     return [];
@@ -7,6 +16,19 @@ async function fetchConfigs() {
   return await res.json();
 }
 
+async function loadConfigs() {
+  const configSet = document.getElementById('configSetSelect').value;
+  const configs = await fetchConfigs(configSet);
+  const select = document.getElementById('configSelect');
+  select.innerHTML = '';
+  configs.forEach(cfg => {
+    const opt = document.createElement('option');
+    opt.value = cfg;
+    opt.textContent = cfg;
+    select.appendChild(opt);
+  });
+}
+
 async function generate() {
   const select = document.getElementById('configSelect');
   const config = select.value;
@@ -14,14 +36,22 @@ async function generate() {
     alert('Please select a config file');
     return;
   }
-  const format = document.querySelector('input[name="format"]:checked').value;
-  const url = `/api/generate?config=${encodeURIComponent(config)}&format=${encodeURIComponent(format)}`;
+  const choice = document.querySelector('input[name="format"]:checked').value;
+  const format = choice === 'pdf-native' ? 'pdf' : choice;
+  const renderer = choice === 'pdf-native' ? 'native' : 'pandoc';
+  const configSet = document.getElementById('configSetSelect').value;
+  const delivery = document.getElementById('zipDelivery').checked ? 'zip' : 'link';
+  const url = `/api/generate?config=${encodeURIComponent(config)}&config_set=${encodeURIComponent(configSet)}&format=${encodeURIComponent(format)}&renderer=${renderer}&delivery=${delivery}`;
   const res = await fetch(url);
   if (!res.ok) {
     const error = await res.json();
     alert(`Error: ${error.detail}`);
     return;
   }
+  if (delivery === 'zip') {
+    downloadBlob(await res.blob(), zipFilename(res));
+    return;
+  }
   const data = await res.json();
   const linksDiv = document.getElementById('links');
   linksDiv.innerHTML = '';
@@ -35,15 +65,33 @@ async function generate() {
   linksDiv.appendChild(ansLink);
 }
 
+function zipFilename(res) {
+  const disposition = res.headers.get('Content-Disposition') || '';
+  const match = disposition.match(/filename="([^"]+)"/);
+  return match ? match[1] : 'test_paper.zip';
+}
+
+function downloadBlob(blob, filename) {
+  const link = document.createElement('a');
+  link.href = URL.createObjectURL(blob);
+  link.download = filename;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(link.href);
+}
+
 document.getElementById('generateBtn').addEventListener('click', generate);
+document.getElementById('configSetSelect').addEventListener('change', loadConfigs);
 
 window.addEventListener('load', async () => {
-  const configs = await fetchConfigs();
-  const select = document.getElementById('configSelect');
-  configs.forEach(cfg => {
+  const configSets = await fetchConfigSets();
+  const setSelect = document.getElementById('configSetSelect');
+  configSets.forEach(configSet => {
     const opt = document.createElement('option');
-    opt.value = cfg;
-    opt.textContent = cfg;
-    select.appendChild(opt);
+    opt.value = configSet;
+    opt.textContent = configSet;
+    setSelect.appendChild(opt);
   });
+  await loadConfigs();
 });
\ No newline at end of file
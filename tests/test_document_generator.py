@@ -0,0 +1,46 @@
+"""Tests for batch generation across a process pool in services.DocumentGenerator."""
+# Modules are imported whole so pytest does not mistake TestPaper* classes for test classes
+import os
+import pickle
+
+import application
+import models
+from services import DocumentGenerator, FileManager
+
+CONFIG = "AL-p01.json"
+CONFIG_SET = "cfg-202602"
+
+
+def make_app(output_folder: str, max_workers: int) -> application.TestPaperApplication:
+    """An application writing to output_folder and rendering batches on max_workers processes."""
+    file_manager = FileManager(output_folder)
+    return application.TestPaperApplication(file_manager=file_manager,
+                                            document_generator=DocumentGenerator(file_manager, max_workers=max_workers))
+
+
+def test_file_manager_survives_pickling(tmp_path):
+    file_manager = pickle.loads(pickle.dumps(FileManager(str(tmp_path))))
+    assert file_manager.reserve_test_filenames("AL-p01")[0][0] == "AL-p01_test.docx"
+
+
+def test_generate_test_papers_on_process_pool(tmp_path):
+    app = make_app(str(tmp_path), max_workers=2)
+    test_data = app.config_loader.load_config(CONFIG, CONFIG_SET)
+    variants = [app.data_shuffler.shuffle_data(test_data, seed=seed) for seed in (1, 2)]
+
+    generated = app.document_generator.generate_test_papers(variants, models.TestPaperConfig(input_filename=CONFIG))
+
+    assert [files.seed for files in generated] == [1, 2]
+    assert all(os.path.isfile(path) for files in generated
+               for path in (files.test_file_path, files.answer_file_path))
+
+
+def test_generate_batch_with_two_workers(tmp_path):
+    app = make_app(str(tmp_path), max_workers=2)
+
+    generated = app.generate_batch(CONFIG, 3, seed=7, config_set=CONFIG_SET)
+
+    pairs = {(files.test_file_path, files.answer_file_path) for files in generated}
+    assert len(pairs) == 3
+    assert all(os.path.isfile(path) for pair in pairs for path in pair)
+    assert len({files.seed for files in generated}) == 3
@@ -0,0 +1,67 @@
+"""Tests for output filename reservation in services.FileManager."""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from services import FileManager
+
+
+def reserve_many(output_folder: str, rounds: int) -> list:
+    """Reserve one name pair per round with a fresh manager, as separate requests would."""
+    return [FileManager(output_folder).reserve_test_filenames("AL-p01")[0] for _ in range(rounds)]
+
+
+def test_sequential_reservations_count_up(tmp_path):
+    file_manager = FileManager(str(tmp_path))
+    names = file_manager.reserve_test_filenames("AL-p01", count=3)
+    assert names == [
+        ("AL-p01_test.docx", "AL-p01_test-0-ans.docx"),
+        ("AL-p01_test-1.docx", "AL-p01_test-1-ans.docx"),
+        ("AL-p01_test-2.docx", "AL-p01_test-2-ans.docx"),
+    ]
+
+
+def test_skips_names_created_outside_the_allocator(tmp_path):
+    (tmp_path / "AL-p01_test-3.pdf").write_bytes(b"")
+    file_manager = FileManager(str(tmp_path))
+    names = file_manager.reserve_test_filenames("AL-p01", count=2)
+    # The scan starts after the existing file, so neither counter collides with it
+    assert [test for test, _ in names] == ["AL-p01_test-4.docx", "AL-p01_test-5.docx"]
+
+
+def test_concurrent_thread_reservations_are_unique(tmp_path):
+    file_manager = FileManager(str(tmp_path))
+    barrier = threading.Barrier(8)
+    results = []
+    lock = threading.Lock()
+
+    def reserve():
+        barrier.wait()
+        names = []
+        for _ in range(20):
+            names.extend(file_manager.reserve_test_filenames("AL-p01", count=2))
+        with lock:
+            results.extend(names)
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 * 20 * 2
+    assert len(set(results)) == len(results)
+
+
+def test_concurrent_process_reservations_are_unique(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        batches = list(executor.map(reserve_many, [str(tmp_path)] * 4, [25] * 4))
+    results = [name for batch in batches for name in batch]
+    assert len(set(results)) == len(results) == 100
+
+
+def test_output_folder_is_created_by_first_reservation(tmp_path):
+    output_folder = tmp_path / "output"
+    file_manager = FileManager(str(output_folder))
+    assert not output_folder.exists()
+    assert file_manager.reserve_test_filenames("AL-p01")[0][0] == "AL-p01_test.docx"
+    assert output_folder.is_dir()
@@ -0,0 +1,35 @@
+"""Tests for serialising profiled runs in profiler.Profiler."""
+import threading
+
+import pytest
+
+from exceptions import ProfilerBusyError
+from profiler import Profiler
+
+
+def test_overlapping_profile_is_refused_without_running(tmp_path):
+    profiler = Profiler(str(tmp_path), sample_every=0)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    results = {}
+    thread = threading.Thread(target=lambda: results.update(first=profiler.run("first", slow)))
+    thread.start()
+    started.wait(5)
+    with pytest.raises(ProfilerBusyError):
+        profiler.run("second", lambda: calls.append(1))
+    release.set()
+    thread.join(5)
+
+    assert calls == []
+    result, record = results["first"]
+    assert result == "first"
+    assert profiler.get_path(record.profile_id, "pstats") == record.pstats_path
+    # The lock is released again once the first profile is written
+    assert profiler.run("third", lambda: "third")[0] == "third"
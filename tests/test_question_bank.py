@@ -0,0 +1,45 @@
+"""Tests for weighted, seeded sampling in question_bank.QuestionBank."""
+# models is imported whole so pytest does not mistake TestData for a test class
+import models
+from question_bank import QuestionBank, word_key
+
+ITEMS_PER_FILE = 20
+
+
+def make_bank() -> QuestionBank:
+    """Two files of distinct words, plus a word that appears in both files."""
+    bank = QuestionBank()
+    for name in ("heavy", "light"):
+        words = [f"{name}{index}" for index in range(ITEMS_PER_FILE)] + ["Shared(ed)" if name == "heavy" else "shared"]
+        bank.add(f"cfg-test/{name}.json", models.TestData(
+            explain_items=[models.TestItem(text=f"meaning of {word}", word=word) for word in words],
+            statement_items=[models.TestItem.statement(f"I wrote {word} down.", word) for word in words],
+        ))
+    return bank
+
+
+def test_same_seed_draws_same_paper():
+    bank = make_bank()
+    first = bank.sample(8, 8, seed=11)
+    again = bank.sample(8, 8, seed=11)
+    assert first == again
+    assert first.seed == 11 and first.caller_seeded
+    assert bank.sample(8, 8, seed=12) != first
+
+
+def test_sample_never_repeats_a_word():
+    bank = make_bank()
+    for seed in range(50):
+        test_data = bank.sample(2 * ITEMS_PER_FILE + 1, 2 * ITEMS_PER_FILE + 1, seed=seed)
+        for items in (test_data.explain_items, test_data.statement_items):
+            keys = [word_key(item.word) for item in items]
+            assert len(keys) == len(set(keys))
+
+
+def test_heavier_file_is_drawn_more_often():
+    bank = make_bank()
+    heavy_draws = sum(
+        bank.sample(1, 0, weights={"*/heavy.json": 9.0}, seed=seed).explain_items[0].word.startswith("heavy")
+        for seed in range(200)
+    )
+    assert heavy_draws > 150
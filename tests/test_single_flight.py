@@ -0,0 +1,159 @@
+"""Tests for coalescing identical concurrent calls in single_flight.SingleFlight."""
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+CALLERS = 8
+
+
+@pytest.fixture(params=["in_process", "lock_folder"])
+def flight(request, tmp_path):
+    """A SingleFlight limited to this process, and one that also takes the cross-process lock."""
+    return SingleFlight(str(tmp_path / "locks") if request.param == "lock_folder" else None)
+
+
+def run_callers(flight: SingleFlight, fn) -> list:
+    """Call flight.do from CALLERS threads at once, returning each result or exception."""
+    barrier = threading.Barrier(CALLERS)
+    outcomes = [None] * CALLERS
+
+    def call(index: int) -> None:
+        barrier.wait()
+        try:
+            outcomes[index] = flight.do("key", fn)
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return outcomes
+
+
+def until_all_waiting(flight: SingleFlight, timeout: float = 5.0) -> None:
+    """Block the leader until every other caller has joined its computation."""
+    deadline = time.monotonic() + timeout
+    while flight.stats()["coalesced"] < CALLERS - 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_share_one_call(flight):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        until_all_waiting(flight)
+        return {"value": 42}
+
+    outcomes = run_callers(flight, fn)
+    assert len(calls) == 1
+    assert outcomes == [{"value": 42}] * CALLERS
+    stats = flight.stats()
+    assert stats["computed"] == 1
+    assert stats["coalesced"] == CALLERS - 1
+    assert stats["in_flight"] == 0
+
+
+def test_exception_reaches_every_waiter(flight):
+    def fn():
+        until_all_waiting(flight)
+        raise ValueError("render failed")
+
+    outcomes = run_callers(flight, fn)
+    assert all(isinstance(outcome, ValueError) and str(outcome) == "render failed" for outcome in outcomes)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_later_calls_compute_again(flight):
+    results = iter(range(3))
+    assert [flight.do("key", lambda: next(results)) for _ in range(3)] == [0, 1, 2]
+    assert flight.stats()["computed"] == 3
+
+
+def test_result_published_while_waiting_is_reused(tmp_path):
+    lock_folder = str(tmp_path / "locks")
+    leader, follower = SingleFlight(lock_folder), SingleFlight(lock_folder)
+    started = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return [1, 2]
+
+    thread = threading.Thread(target=lambda: results.update(
+        leader=leader.do("key", slow, encode=list, decode=list)))
+    thread.start()
+    started.wait(5)
+    # A second instance stands in for another worker process waiting on the same lock file
+    follower_thread = threading.Thread(target=lambda: results.update(
+        follower=follower.do("key", lambda: [3], encode=list, decode=list)))
+    follower_thread.start()
+    time.sleep(0.05)
+    release.set()
+    thread.join(5)
+    follower_thread.join(5)
+
+    assert results == {"leader": [1, 2], "follower": [1, 2]}
+    assert follower.stats()["shared_across_processes"] == 1
+
+
+def test_waiter_outlasts_holders_render(tmp_path):
+    lock_folder = str(tmp_path / "locks")
+    # One stripe puts every key on the same lock file
+    leader, follower, other = (SingleFlight(lock_folder, stripes=1, poll_interval=0.01) for _ in range(3))
+    started = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return [1, 2]
+
+    thread = threading.Thread(target=lambda: results.update(
+        leader=leader.do("key", slow, encode=list, decode=list)))
+    thread.start()
+    started.wait(5)
+    follower_thread = threading.Thread(target=lambda: results.update(
+        follower=follower.do("key", lambda: [3], encode=list, decode=list)))
+    follower_thread.start()
+
+    # An unrelated key on the same stripe does not wait for the render
+    assert other.do("other", lambda: "done") == "done"
+    time.sleep(0.2)
+    assert follower_thread.is_alive()
+    release.set()
+    thread.join(5)
+    follower_thread.join(5)
+
+    assert results == {"leader": [1, 2], "follower": [1, 2]}
+    assert follower.stats()["computed"] == 0
+
+
+def test_abandoned_claim_is_taken_over(tmp_path):
+    lock_folder = str(tmp_path / "locks")
+    leader = SingleFlight(lock_folder)
+    follower = SingleFlight(lock_folder, claim_timeout=0.1, poll_interval=0.01)
+    started = threading.Event()
+    release = threading.Event()
+
+    def stuck():
+        started.set()
+        release.wait(5)
+        return [1]
+
+    thread = threading.Thread(target=lambda: leader.do("key", stuck, encode=list, decode=list))
+    thread.start()
+    started.wait(5)
+    try:
+        assert follower.do("key", lambda: [2], encode=list, decode=list) == [2]
+    finally:
+        release.set()
+        thread.join(5)
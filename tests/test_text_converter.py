@@ -0,0 +1,42 @@
+"""Tests for converting the data/*.txt vocabulary sheets in text_converter."""
+import os
+import shutil
+
+import pytest
+
+from text_converter import convert_folder, convert_lines, find_sentence_word
+from variables import DATA_FOLDER
+
+
+@pytest.mark.parametrize("source, explain, statement", [("ALP16.txt", 10, 10), ("1A-P16.txt", 8, 8)])
+def test_bundled_sheets_convert_every_item(source, explain, statement):
+    with open(os.path.join(DATA_FOLDER, source), encoding="utf-8-sig") as f:
+        data = convert_lines(f)
+    assert (len(data["explain"]), len(data["statement"])) == (explain, statement)
+    assert all(answer for _, answer in data["explain"] + data["statement"])
+
+
+@pytest.mark.parametrize("word, sentence, expected", [
+    ("character", "They are the two main characters in the play.", "characters"),
+    ("inspire", "His speech inspired us to work harder.", "inspired"),
+    ("peek", "Turtle peeks out of his shell.", "peeks"),
+    ("homemade", "Homemade jam is the best!", "Homemade"),
+    ("carry", "She carried the box upstairs.", "carried"),
+    ("fire truck", "Two Fire Trucks drove past.", "Fire Trucks"),
+    ("dash", "Nothing here matches.", "dash"),
+])
+def test_find_sentence_word_keeps_inflected_form(word, sentence, expected):
+    assert find_sentence_word(word, sentence) == expected
+
+
+def test_unchanged_source_is_skipped(tmp_path):
+    input_folder = tmp_path / "data"
+    input_folder.mkdir()
+    shutil.copy(os.path.join(DATA_FOLDER, "ALP16.txt"), input_folder)
+    output_folder = str(tmp_path / "converted")
+
+    first = convert_folder(str(input_folder), output_folder, workers=1)
+    second = convert_folder(str(input_folder), output_folder, workers=1)
+
+    assert first == {"converted": ["ALP16.txt"], "unchanged": [], "failed": []}
+    assert second == {"converted": [], "unchanged": ["ALP16.txt"], "failed": []}
@@ -0,0 +1,81 @@
+"""Tests for the pre-rendered variant pool in warm_pool.WarmPool."""
+import itertools
+import threading
+import time
+
+from warm_pool import WarmPool
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    """Poll until condition() is true, failing the test after the timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def depth(pool: WarmPool, key) -> int:
+    """Variants currently waiting for one key."""
+    return next((entry["depth"] for entry in pool.stats()["pools"] if entry["key"] == key), 0)
+
+
+def filled_pool(keys, pool_depth: int = 2, **kwargs):
+    """A pool whose pinned keys have been filled, with its workers stopped, and its produce log."""
+    counter = itertools.count()
+    produced = []
+    lock = threading.Lock()
+
+    def produce(key):
+        with lock:
+            produced.append(key)
+        return (key, next(counter))
+
+    pool = WarmPool(produce, depth=pool_depth, max_keys=0, pinned=keys, retry_interval=0.05, **kwargs)
+    pool.start()
+    try:
+        wait_until(lambda: all(depth(pool, key) == pool_depth for key in keys))
+    finally:
+        pool.stop()
+    return pool, produced
+
+
+def test_take_hands_out_variants_then_misses():
+    pool, _ = filled_pool(["a"])
+    assert pool.take("a")[0] == "a"
+    assert pool.take("a")[0] == "a"
+    assert pool.take("a") is None
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_version_bump_discards_old_variants():
+    version = [1]
+    pool, _ = filled_pool(["a"], version=lambda: version[0])
+    version[0] = 2
+    assert pool.take("a") is None
+    assert pool.stats()["discarded"] == 2
+
+
+def test_invalid_variants_are_discarded():
+    valid = [True]
+    pool, _ = filled_pool(["a"], valid=lambda value: valid[0])
+    valid[0] = False
+    assert pool.take("a") is None
+    assert pool.stats()["discarded"] == 2
+
+
+def test_refills_the_emptiest_key_first():
+    pool, produced = filled_pool(["a", "b"], pool_depth=2)
+    pool.take("a")
+    pool.take("b")
+    pool.take("b")
+    del produced[:]
+
+    pool.start()
+    try:
+        wait_until(lambda: depth(pool, "a") == 2 and depth(pool, "b") == 2)
+    finally:
+        pool.stop()
+    # "b" was empty and "a" still had one variant, so "b" is rendered first
+    assert produced[0] == "b"
+    assert sorted(produced) == ["a", "b", "b"]
@@ -0,0 +1,232 @@
+"""
+Converts raw vocabulary sheets (data/*.txt) into cfg JSON files (see from-text-to-cfg-spec.md).
+Sources are parsed line by line in parallel, and only sources whose content changed since the
+last run are converted again.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from variables import CFG_OUTPUT_FOLDER, DATA_FOLDER
+
+CONVERTER_VERSION = 1  # Bump when parsing changes so every source is converted again
+MANIFEST_NAME = ".manifest.json"
+
+# "12." on its own line starts an entry in numbered sheets (e.g. ALP16.txt)
+NUMBERED_ENTRY = re.compile(r"^\s*(\d+)\.\s*(.*)$")
+# "<bullet> dash (p.167) verb 急奔" starts an entry in page-referenced sheets (e.g. 1A-P16.txt)
+PAGE_ENTRY = re.compile(r"^\W*(?P<word>[A-Za-z][^()]*?(?:\([a-z]+\))?)\s*\(p\.\s*\w+\)\s*(?P<rest>.*)$")
+PART_OF_SPEECH = re.compile(
+    r"\b(?:n|v|adj|adv|prep|conj|pron|phr|int|noun|verb|adjective|adverb|preposition|pronoun)\.?(?=\s|$)"
+)
+CJK = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]+")
+QUOTES = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+
+
+def iter_entries(lines: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+    """Group a sheet's lines into (layout, entry lines) without reading the whole file first."""
+    layout = None
+    entry: List[str] = []
+    for raw_line in lines:
+        line = raw_line.translate(QUOTES).strip()
+        numbered = NUMBERED_ENTRY.match(line)
+        if numbered or PAGE_ENTRY.match(line):
+            if layout is not None:
+                yield layout, entry
+            if numbered:
+                layout, entry = "numbered", [numbered.group(2)]
+            else:
+                layout, entry = "page", [line]
+        elif layout is not None:
+            entry.append(line)
+    if layout is not None:
+        yield layout, entry
+
+
+def parse_numbered_entry(lines: List[str]) -> Optional[Tuple[str, str, str]]:
+    """Parse word, Chinese and POS, definition, then a "*" example sentence."""
+    lines = [line for line in lines if line]
+    if not lines:
+        return None
+    word = lines[0]
+    text = " ".join(lines[1:])
+    before, _, example = text.partition("*")
+    pos = PART_OF_SPEECH.search(before)
+    definition = before[pos.end():] if pos else before
+    return word, _clean(definition), _clean(example)
+
+
+def parse_page_entry(lines: List[str]) -> Optional[Tuple[str, str, str]]:
+    """Parse a "word (p.N) pos" line, lowercase definition lines, then the example sentence."""
+    match = PAGE_ENTRY.match(lines[0])
+    word = match.group("word").strip()
+    rest = PART_OF_SPEECH.sub("", match.group("rest"), count=1)
+    body = [_clean(line) for line in [rest] + lines[1:]]
+    # Section titles such as "READING" are all capitals
+    body = [line for line in body if line and not line.isupper()]
+
+    definition: List[str] = []
+    example: List[str] = []
+    for line in body:
+        if example or line[0].isupper():
+            example.append(line)
+        else:
+            definition.append(line)
+    return word, " ".join(definition), " ".join(example)
+
+
+def find_sentence_word(word: str, sentence: str) -> str:
+    """Find the form of a word used in a sentence, keeping its case, tense and plural."""
+    base = re.sub(r"\([a-z]+\)$", "", word).strip()
+    *leading, last = base.split()
+    stems = [last]
+    if last.endswith("e"):
+        stems.append(last[:-1])
+    if last.endswith("y"):
+        stems.append(last[:-1] + "i")
+    for stem in stems:
+        pattern = r"\s+".join([re.escape(part) for part in leading] + [re.escape(stem) + r"[a-z]*"])
+        match = re.search(rf"\b{pattern}\b", sentence, flags=re.IGNORECASE)
+        if match:
+            return match.group(0)
+    return base
+
+
+def _clean(text: str) -> str:
+    """Drop Chinese glosses and the separators they leave behind, and collapse whitespace."""
+    text = CJK.sub(" ", text)
+    text = re.sub(r"^[\s;.…]+", "", text)
+    return re.sub(r"\s+([;,.!?])", r"\1", " ".join(text.split()))
+
+
+def convert_lines(lines: Iterable[str]) -> Dict[str, List[List[str]]]:
+    """Convert a vocabulary sheet into cfg data."""
+    explain = []
+    statement = []
+    for layout, entry in iter_entries(lines):
+        parsed = parse_numbered_entry(entry) if layout == "numbered" else parse_page_entry(entry)
+        if parsed is None:
+            continue
+        word, definition, example = parsed
+        if definition:
+            explain.append([definition, word])
+        if example:
+            statement.append([example, find_sentence_word(word, example)])
+    return {"explain": explain, "statement": statement}
+
+
+def format_cfg(data: Dict[str, List[List[str]]]) -> str:
+    """Serialise cfg data with one item per line, like the hand-written config sets."""
+    sections = []
+    for key in ("explain", "statement"):
+        items = ",\n".join(f"    {json.dumps(item, ensure_ascii=False)}" for item in data[key])
+        sections.append(f'  "{key}": [\n{items}\n  ]')
+    return "{\n" + ",\n".join(sections) + "\n}\n"
+
+
+def convert_file(source_path: str, output_folder: str) -> Tuple[str, int, int]:
+    """Convert one source file and write its JSON, returning (output path, explain, statement)."""
+    with open(source_path, encoding="utf-8-sig") as f:
+        data = convert_lines(f)
+    name = os.path.splitext(os.path.basename(source_path))[0] + ".json"
+    output_path = os.path.join(output_folder, name)
+    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(format_cfg(data))
+    return output_path, len(data["explain"]), len(data["statement"])
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a source file."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def convert_folder(input_folder: str = DATA_FOLDER, output_folder: str = CFG_OUTPUT_FOLDER,
+                   workers: Optional[int] = None, force: bool = False) -> Dict[str, List[str]]:
+    """Convert every changed source in parallel; returns converted, unchanged and failed sources."""
+    os.makedirs(output_folder, exist_ok=True)
+    manifest_path = os.path.join(output_folder, MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    sources = sorted(glob.glob(os.path.join(input_folder, "*.txt")))
+    hashes = {os.path.basename(path): file_hash(path) for path in sources}
+    pending = []
+    unchanged = []
+    for path in sources:
+        name = os.path.basename(path)
+        entry = manifest.get(name, {})
+        output_path = os.path.join(output_folder, entry.get("output", ""))
+        if (not force and entry.get("sha256") == hashes[name]
+                and entry.get("converter") == CONVERTER_VERSION and os.path.isfile(output_path)):
+            unchanged.append(name)
+        else:
+            pending.append(path)
+
+    converted = []
+    failed = []
+    max_workers = min(len(pending), workers or os.cpu_count() or 1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(convert_file, path, output_folder) for path in pending]
+            results = [(path, _result_or_error(future.result)) for path, future in zip(pending, futures)]
+    else:
+        results = [(path, _result_or_error(convert_file, path, output_folder)) for path in pending]
+
+    for path, result in results:
+        name = os.path.basename(path)
+        if isinstance(result, Exception):
+            print(f"Warning: Failed to convert {name}: {result}")
+            manifest.pop(name, None)
+            failed.append(name)
+            continue
+        output_path, explain_count, statement_count = result
+        manifest[name] = {
+            "sha256": hashes[name],
+            "output": os.path.basename(output_path),
+            "converter": CONVERTER_VERSION,
+        }
+        print(f"Converted {name} -> {output_path} ({explain_count} explain, {statement_count} statement)")
+        converted.append(name)
+
+    # Forget sources that no longer exist
+    manifest = {name: entry for name, entry in manifest.items() if name in hashes}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return {"converted": converted, "unchanged": unchanged, "failed": failed}
+
+
+def _result_or_error(fn, *args):
+    """Call fn, returning the exception instead of raising it."""
+    try:
+        return fn(*args)
+    except Exception as e:
+        return e
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Convert data/*.txt vocabulary sheets into cfg JSON files")
+    parser.add_argument("--input", default=DATA_FOLDER, help="Folder with the .txt sources")
+    parser.add_argument("--output", default=CFG_OUTPUT_FOLDER, help="Folder to write the .json configs to")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Convert every source, even unchanged ones")
+    args = parser.parse_args()
+
+    result = convert_folder(args.input, args.output, workers=args.jobs, force=args.force)
+    print(f"{len(result['converted'])} converted, {len(result['unchanged'])} unchanged, "
+          f"{len(result['failed'])} failed")
+    sys.exit(1 if result["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,21 @@ _HERE = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = _HERE
 CFG_VERSION = "cfg-202602"  # Change this in one place when rolling over to a new config set
 CFG_FOLDER = os.path.join(_HERE, CFG_VERSION)
+CFG_SET_PREFIX = "cfg-"  # Every folder with this prefix is a config set
 OUTPUT_FOLDER = os.path.join(os.getcwd(), "output")  # Write output to user's working directory
+CACHE_FOLDER = os.path.join(OUTPUT_FOLDER, ".cache")  # Content-addressed copies of generated files
 STATIC_FOLDER = os.path.join(_HERE, "static")
+DATA_FOLDER = os.path.join(_HERE, "data")  # Raw vocabulary sheets (*.txt)
+CFG_OUTPUT_FOLDER = os.path.join(_HERE, "converted-cfg")  # Configs converted from DATA_FOLDER; no cfg- prefix, so it is not a config set
 
 __all__ = [
     "BASE_DIR",
     "CFG_VERSION",
     "CFG_FOLDER",
+    "CFG_SET_PREFIX",
     "OUTPUT_FOLDER",
+    "CACHE_FOLDER",
     "STATIC_FOLDER",
+    "DATA_FOLDER",
+    "CFG_OUTPUT_FOLDER",
 ]
@@ -0,0 +1,178 @@
+"""
+Warm pool of pre-rendered test papers.
+Keeps a few ready-made variants of pinned and most requested configs, so a request without a
+seed is handed finished files while background workers render replacements.
+"""
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class WarmPool:
+    """Per-key queues of pre-rendered variants, refilled in background threads."""
+
+    def __init__(self, produce: Callable[[Hashable], Any], depth: int = 3, max_keys: int = 8,
+                 pinned: Iterable[Hashable] = (), workers: int = 1,
+                 version: Optional[Callable[[], int]] = None,
+                 valid: Optional[Callable[[Any], bool]] = None,
+                 retry_interval: float = 30, decay_interval: float = 600):
+        # Renders one variant for a key; runs on a pool worker thread
+        self.produce = produce
+        self.depth = depth
+        self.max_keys = max_keys
+        self.pinned = list(pinned)
+        self.workers = workers
+        # Variants rendered under an older version (e.g. before a config edit) are discarded
+        self.version = version or (lambda: 0)
+        # Variants failing this check (e.g. whose files were deleted) are discarded instead of handed out
+        self.valid = valid or (lambda value: True)
+        self.retry_interval = retry_interval
+        self.decay_interval = decay_interval
+        self._pools: Dict[Hashable, Deque[Tuple[int, Any]]] = {}
+        self._in_flight: Counter = Counter()
+        self._demand: Counter = Counter()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._failed_until: Dict[Hashable, float] = {}
+        self._stats = {"produced": 0, "failures": 0, "discarded": 0}
+        self._last_decay = time.monotonic()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+
+    def take(self, key: Hashable) -> Optional[Any]:
+        """Hand out a pre-rendered variant, or None when the pool for this key is empty."""
+        current = self.version()
+        with self._condition:
+            self._demand[key] += 1
+            pool = self._pools.get(key)
+            while pool:
+                version, value = pool.popleft()
+                if version == current and self.valid(value):
+                    self._hits[key] += 1
+                    self._condition.notify()
+                    return value
+                self._stats["discarded"] += 1
+            self._misses[key] += 1
+            # A miss may have just made this key one of the most requested
+            self._condition.notify()
+            return None
+
+    def values(self) -> List[Any]:
+        """Every variant currently waiting in a pool."""
+        with self._condition:
+            return [value for pool in self._pools.values() for _, value in pool]
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit rate and depth overall and for each warm or requested key."""
+        with self._condition:
+            warm = set(self._warm_keys())
+            keys = sorted(warm | set(self._demand), key=lambda key: (-self._demand[key], str(key)))
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            return {
+                **self._stats,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "target_depth": self.depth,
+                "pools": [
+                    {
+                        "key": list(key) if isinstance(key, tuple) else key,
+                        "warm": key in warm,
+                        "depth": len(self._pools.get(key, ())),
+                        "in_flight": self._in_flight[key],
+                        "hits": self._hits[key],
+                        "misses": self._misses[key],
+                        "hit_rate": (self._hits[key] / (self._hits[key] + self._misses[key])
+                                     if self._hits[key] + self._misses[key] else 0.0),
+                    }
+                    for key in keys
+                ],
+            }
+
+    def start(self) -> None:
+        """Start the refill workers."""
+        if self._threads:
+            return
+        self._stopping = False
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"warm-pool-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop the refill workers; variants already rendered stay in the output folder."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def _run(self) -> None:
+        """Render variants for the emptiest warm pool until asked to stop."""
+        while True:
+            with self._condition:
+                key = self._next_key()
+                while key is None and not self._stopping:
+                    # Wake up now and then to retry failed keys and age demand
+                    self._condition.wait(timeout=min(self.retry_interval, self.decay_interval))
+                    key = self._next_key()
+                if self._stopping:
+                    return
+                self._in_flight[key] += 1
+            version = self.version()
+
+            try:
+                value = self.produce(key)
+            except Exception as e:
+                print(f"Warning: Pre-rendering {key} failed: {e}")
+                value = None
+            with self._condition:
+                self._in_flight[key] -= 1
+                if value is None:
+                    self._stats["failures"] += 1
+                    self._failed_until[key] = time.monotonic() + self.retry_interval
+                elif version != self.version():
+                    self._stats["discarded"] += 1
+                else:
+                    self._pools.setdefault(key, deque()).append((version, value))
+                    self._stats["produced"] += 1
+
+    def _warm_keys(self) -> List[Hashable]:
+        """Pinned keys, then the most requested ones up to max_keys."""
+        keys = list(self.pinned)
+        for key, _ in self._demand.most_common():
+            if len(keys) >= len(self.pinned) + self.max_keys:
+                break
+            if key not in keys:
+                keys.append(key)
+        return keys
+
+    def _next_key(self) -> Optional[Hashable]:
+        """The warm key furthest below its target depth; caller holds the lock."""
+        now = time.monotonic()
+        if now - self._last_decay >= self.decay_interval:
+            # Halve demand so configs that stop being requested cool down
+            self._demand = Counter({key: count // 2 for key, count in self._demand.items() if count > 1})
+            self._last_decay = now
+
+        current = self.version()
+        best_key = None
+        best_fill = self.depth
+        for key in self._warm_keys():
+            if self._failed_until.get(key, 0) > now:
+                continue
+            pool = self._pools.get(key)
+            if pool:
+                usable = [entry for entry in pool if entry[0] == current and self.valid(entry[1])]
+                if len(usable) < len(pool):
+                    self._stats["discarded"] += len(pool) - len(usable)
+                    pool = self._pools[key] = deque(usable)
+            fill = len(pool or ()) + self._in_flight[key]
+            if fill < best_fill:
+                best_key = key
+                best_fill = fill
+        return best_key